@@ -0,0 +1,77 @@
+# benchmark_vision.py
+# Times gnome_vision.detect_blobs against the per-pixel loop it replaced.
+# Run outside Webots: python benchmark_vision.py [--frames recorded.npy]
+import argparse
+import math
+import time
+import numpy as np
+from gnome_vision import RED_THRESHOLD, GREEN_MAX, BLUE_MAX, MIN_BLOB_SIZE, detect_blobs
+
+ASTRA_WIDTH, ASTRA_HEIGHT, ASTRA_FOV = 640, 480, 1.0236
+
+def legacy_find_red_center(image):
+    """The original find_gnomes loop: one centroid for every red pixel in the frame."""
+    height, width = image.shape[:2]
+    red_pixels = []
+    for y in range(height):
+        for x in range(width):
+            pixel = image[y, x]
+            if pixel[2] > RED_THRESHOLD and pixel[1] < GREEN_MAX and pixel[0] < BLUE_MAX:
+                red_pixels.append((x, y))
+    if len(red_pixels) < MIN_BLOB_SIZE: return None
+    return sum([p[0] for p in red_pixels]) / len(red_pixels)
+
+def synthetic_frames(count, width, height, seed=0):
+    """BGRA frames with a noisy floor and a few red ellipses (gnomes) of random size."""
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:height, 0:width]
+    frames = np.empty((count, height, width, 4), dtype=np.uint8)
+    for frame in frames:
+        frame[:] = rng.integers(40, 140, size=(height, width, 4), dtype=np.uint8)
+        frame[:, :, 3] = 255
+        for _ in range(rng.integers(0, 5)):
+            cx, cy = rng.integers(0, width), rng.integers(height // 3, height)
+            rx, ry = rng.integers(5, 40), rng.integers(10, 60)
+            inside = ((xs - cx) / rx) ** 2 + ((ys - cy) / ry) ** 2 <= 1.0
+            frame[inside] = (30, 30, 200, 255)
+    return frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of red-blob gnome detection")
+    parser.add_argument("--frames", help=".npy array (n, h, w, 4) of recorded camera images")
+    parser.add_argument("--count", type=int, default=50, help="synthetic frames when --frames is not given")
+    parser.add_argument("--time-step", type=float, default=32.0, help="basic time step of the world, in ms")
+    parser.add_argument("--fov", type=float, default=ASTRA_FOV)
+    parser.add_argument("--legacy", type=int, default=1, help="frames to time with the old per-pixel loop")
+    args = parser.parse_args()
+
+    frames = np.load(args.frames) if args.frames else synthetic_frames(args.count, ASTRA_WIDTH, ASTRA_HEIGHT)
+    height, width = frames.shape[1:3]
+    print(f"{len(frames)} frames of {width}x{height}")
+
+    times, blobs_found = [], 0
+    for frame in frames:
+        start = time.perf_counter()
+        blobs = detect_blobs(frame, args.fov)
+        times.append(time.perf_counter() - start)
+        blobs_found += len(blobs)
+    times = np.array(times) * 1000
+    print(f"vectorized: mean {times.mean():.2f} ms | p99 {np.percentile(times, 99):.2f} ms | max {times.max():.2f} ms "
+          f"| {blobs_found} blobs")
+    print(f"budget: {args.time_step:.0f} ms per step -> {'fits' if times.max() < args.time_step else 'DOES NOT FIT'}")
+
+    for frame in frames[:args.legacy]:
+        start = time.perf_counter()
+        center_x = legacy_find_red_center(frame)
+        elapsed = (time.perf_counter() - start) * 1000
+        blobs = detect_blobs(frame, args.fov, min_area=0)
+        if blobs and center_x is not None:
+            # Area-weighted mean of the blob centroids must equal the old single centroid
+            merged = sum(b['centroid'][0] * b['area'] for b in blobs) / sum(b['area'] for b in blobs)
+            agree = math.isclose(merged, center_x, abs_tol=1e-6)
+        else:
+            agree = (center_x is None) == (sum(b['area'] for b in blobs) < MIN_BLOB_SIZE)
+        print(f"legacy loop: {elapsed:.0f} ms for one frame ({elapsed / times.mean():.0f}x slower), same centroid: {agree}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 from controller import Robot
 import math
 import numpy as np
+from gnome_vision import detect_blobs
+from SpatialHash import SpatialHash  # pythonTesting/, added to PYTHONPATH by runtime.ini
 
 # --- Constants ---
 MAX_SPEED = 7.0
@@ -13,6 +15,7 @@ TARGET_TOLERANCE_ANGLE = 0.05
 FIELD_SIZE_X = 10.0
 FIELD_SIZE_Y = 10.0
 DROP_OFF_POINT = (0.5, 0.5) # Example drop-off location
+DUPLICATE_RADIUS = 0.5 # Detections closer than this to a known gnome are the same gnome
 
 MOTOR_NAMES = [
     "head_2_joint", "head_1_joint", "torso_lift_joint", "arm_1_joint",
@@ -48,6 +51,7 @@ class TiagoController:
         # --- State Machine & Data ---
         self.state = 'MAPPING'
         self.gnome_locations = []
+        self.gnome_index = SpatialHash(DUPLICATE_RADIUS)
         self.patrol_points = self.generate_patrol_points(step=1.0)
         self.current_target_index = 0
         
@@ -160,51 +164,30 @@ class TiagoController:
         delta_theta = (dist_right - dist_left) / AXLE_LENGTH
         self.x += delta_dist * math.cos(self.theta + delta_theta / 2.0)
         self.y += delta_dist * math.sin(self.theta + delta_theta / 2.0)
+        self.theta += delta_theta
         self.theta = math.atan2(math.sin(self.theta), math.cos(self.theta))
         
     def find_gnomes(self):
-        """Processes a camera image to find gnomes and adds them to the list."""
+        """Processes a camera image to find gnomes and adds every new blob to the list."""
         image_data = self.camera.getImage()
         if not image_data: return
 
         image = np.frombuffer(image_data, np.uint8).reshape((self.image_height, self.image_width, 4))
 
-        # TUNE THESE VALUES for your specific lighting
-        RED_THRESHOLD = 150
-        GREEN_MAX = 100
-        BLUE_MAX = 100
-        MIN_BLOB_SIZE = 20
-
-        red_pixels = []
-        for y in range(self.image_height):
-            for x in range(self.image_width):
-                pixel = image[y, x]
-                if pixel[2] > RED_THRESHOLD and pixel[1] < GREEN_MAX and pixel[0] < BLUE_MAX:
-                    red_pixels.append((x, y))
-
-        if len(red_pixels) < MIN_BLOB_SIZE: return
-
-        center_x = sum([p[0] for p in red_pixels]) / len(red_pixels)
-        angle_per_pixel = self.camera_fov / self.image_width
-        angle_to_gnome = (center_x - self.image_width / 2.0) * angle_per_pixel
-        
         # Simple distance estimation: assume gnomes detected are about 1m away
         DETECTION_DISTANCE = 1.0
-        gnome_world_x = self.x + DETECTION_DISTANCE * math.cos(self.theta + angle_to_gnome)
-        gnome_world_y = self.y + DETECTION_DISTANCE * math.sin(self.theta + angle_to_gnome)
-        
-        new_gnome_pos = (gnome_world_x, gnome_world_y)
+        for blob in detect_blobs(image, self.camera_fov):
+            angle_to_gnome = blob['bearing']
+            gnome_world_x = self.x + DETECTION_DISTANCE * math.cos(self.theta + angle_to_gnome)
+            gnome_world_y = self.y + DETECTION_DISTANCE * math.sin(self.theta + angle_to_gnome)
+            new_gnome_pos = (gnome_world_x, gnome_world_y)
 
-        # Check for duplicates before adding
-        is_duplicate = False
-        for existing_pos in self.gnome_locations:
-            if math.dist(new_gnome_pos, existing_pos) < 0.5:
-                is_duplicate = True
-                break
-        
-        if not is_duplicate:
-            print(f"New gnome detected! Estimated Pos: ({gnome_world_x:.2f}, {gnome_world_y:.2f})")
+            # Check for duplicates before adding
+            if self.gnome_index.any_within(new_gnome_pos, DUPLICATE_RADIUS):
+                continue
+            print(f"New gnome detected! Estimated Pos: ({gnome_world_x:.2f}, {gnome_world_y:.2f}), {blob['area']} px")
             self.gnome_locations.append(new_gnome_pos)
+            self.gnome_index.insert(new_gnome_pos)
 
     def pickup_sequence(self):
         # TODO: Implement the arm and gripper sequence for picking up a gnome.
@@ -263,7 +246,7 @@ class TiagoController:
             elif self.state == 'DROPPING_OFF_GNOME':
                 self.dropoff_sequence()
                 # Remove the gnome we just delivered from the list
-                self.gnome_locations.pop(0)
+                self.gnome_index.remove(self.gnome_locations.pop(0))
                 if self.gnome_locations:
                     # If there are more gnomes, go back to the COLLECTING state
                     self.state = 'COLLECTING'
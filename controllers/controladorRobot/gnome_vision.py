@@ -0,0 +1,74 @@
+# gnome_vision.py
+# Red-blob detection for the Tiago camera, vectorized with NumPy.
+import numpy as np
+
+# TUNE THESE VALUES for your specific lighting
+RED_THRESHOLD = 150
+GREEN_MAX = 100
+BLUE_MAX = 100
+MIN_BLOB_SIZE = 20
+
+def red_mask(image):
+    """Boolean (h, w) mask of red pixels in a BGRA camera image."""
+    return (image[:, :, 2] > RED_THRESHOLD) & (image[:, :, 1] < GREEN_MAX) & (image[:, :, 0] < BLUE_MAX)
+
+def find_runs(mask):
+    """Horizontal runs of True pixels as (rows, starts, ends) arrays, ends exclusive."""
+    # Only rows that contain red are scanned for run edges
+    hit_rows = np.flatnonzero(mask.any(axis=1))
+    padded = np.zeros((len(hit_rows), mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask[hit_rows]
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return hit_rows[rows], starts, ends
+
+def label_runs(rows, starts, ends):
+    """Union-find over runs: runs in consecutive rows that touch (8-connectivity) join the same blob."""
+    parent = list(range(len(rows)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Runs come sorted by row and then by start, so each row is a contiguous slice
+    row_bounds = np.searchsorted(rows, np.arange(rows[-1] + 2)) if len(rows) else []
+    rows, starts, ends = rows.tolist(), starts.tolist(), ends.tolist()
+    for row in range(1, len(row_bounds) - 1):
+        i, i_end = row_bounds[row - 1], row_bounds[row]
+        j, j_end = row_bounds[row], row_bounds[row + 1]
+        # Two-pointer sweep over the previous row and this one
+        while i < i_end and j < j_end:
+            if starts[i] <= ends[j] and starts[j] <= ends[i]:
+                a, b = find(i), find(j)
+                if a != b: parent[max(a, b)] = min(a, b)
+            if ends[i] < ends[j]: i += 1
+            else: j += 1
+    return np.array([find(i) for i in range(len(parent))], dtype=np.intp)
+
+def detect_blobs(image, fov, min_area=MIN_BLOB_SIZE):
+    """Red blobs in a BGRA image, largest first.
+
+    Each blob is a dict with the bearing (radians from the image centre, same
+    convention as the controller), its pixel area and its centroid (x, y).
+    """
+    height, width = image.shape[:2]
+    rows, starts, ends = find_runs(red_mask(image))
+    if len(rows) == 0: return []
+    labels = label_runs(rows, starts, ends)
+
+    lengths = ends - starts
+    area = np.bincount(labels, weights=lengths)
+    # Sum of x over a run [s, e) is len * (s + e - 1) / 2
+    sum_x = np.bincount(labels, weights=lengths * (starts + ends - 1) / 2.0)
+    sum_y = np.bincount(labels, weights=lengths * rows)
+
+    blobs = []
+    angle_per_pixel = fov / width
+    for label in np.nonzero(area >= max(min_area, 1))[0]:
+        cx, cy = sum_x[label] / area[label], sum_y[label] / area[label]
+        blobs.append({'bearing': (cx - width / 2.0) * angle_per_pixel, 'area': int(area[label]), 'centroid': (cx, cy)})
+    blobs.sort(key=lambda b: b['area'], reverse=True)
+    return blobs
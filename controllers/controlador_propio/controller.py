@@ -1,4 +1,5 @@
 from controller import Robot
+import numpy as np
 
 # --- Constantes ---
 MAX_SPEED = 5.24
@@ -6,6 +7,14 @@ CRUISING_SPEED = 4.0
 RANGE_THRESHOLD = 1.2  # distancia mínima (m) para considerar obstáculo
 SLOWDOWN_FACTOR = 0.5
 
+# --- Histograma de campo vectorial (VFH) ---
+NUM_SECTORS = 15        # sectores angulares en que se divide la imagen
+BAND_FRACTION = 0.3     # fracción central de filas que se analiza (evita suelo y techo)
+STOP_DISTANCE = 0.45    # un sector con algo más cerca que esto está bloqueado
+FREE_THRESHOLD = 0.6    # espacio libre mínimo para que un sector sea candidato
+TURN_PENALTY = 0.35     # preferencia por seguir recto frente a girar (por radián)
+K_TURN = 3.0            # ganancia del giro (rad/s de rueda por radián de error)
+
 # --- Inicialización ---
 robot = Robot()
 time_step = int(robot.getBasicTimeStep())
@@ -24,38 +33,62 @@ kinect_range.enable(time_step)
 
 width = kinect_range.getWidth()
 height = kinect_range.getHeight()
-half_width = width // 2
-mid_height = height // 2
+max_range = kinect_range.getMaxRange()
+fov = kinect_range.getFov()
+
+# Todo lo que no depende de la imagen se calcula una sola vez
+band_half = max(1, int(height * BAND_FRACTION / 2))
+band = slice(height // 2 - band_half, height // 2 + band_half + 1)
+sector_starts = np.linspace(0, width, NUM_SECTORS + 1).astype(int)[:-1]
+sector_cols = np.diff(np.append(sector_starts, width))
+# Ángulo del centro de cada sector: positivo a la izquierda (columna 0 = izquierda de la imagen)
+sector_angles = (width / 2.0 - (sector_starts + sector_cols / 2.0)) / width * fov
+# Peso de cada fila de la banda: las centrales cuentan más que los bordes
+row_weights = np.hanning(2 * band_half + 3)[1:-1].astype(np.float32)
+row_weights /= row_weights.sum()
+
+def read_depth():
+    """Imagen de profundidad completa (alto x ancho, metros) en una sola llamada."""
+    buffer = kinect_range.getRangeImage(data_type="buffer")
+    return np.frombuffer(buffer, dtype=np.float32).reshape(height, width)
+
+def sector_histograms(depth):
+    """Mínimo por sector y espacio libre ponderado (0 = lleno, 1 = libre) sobre la banda de filas."""
+    # Sin retorno (inf/nan) equivale a libre hasta el alcance máximo
+    rows = np.nan_to_num(depth[band], nan=max_range, posinf=max_range)
+    column_min = rows.min(axis=0)
+    sector_min = np.minimum.reduceat(column_min, sector_starts)
+    # Ocupación de cada píxel: crece cuadráticamente al acercarse por debajo del umbral
+    occupancy = np.clip(1.0 - rows / RANGE_THRESHOLD, 0.0, 1.0)
+    occupancy *= occupancy
+    column_occupancy = row_weights @ occupancy
+    free = 1.0 - np.add.reduceat(column_occupancy, sector_starts) / sector_cols
+    return sector_min, free
+
+def steer(sector_min, free):
+    """Ley de dirección VFH: el valle libre más cercano al frente. Devuelve (izquierda, derecha)."""
+    candidates = (sector_min > STOP_DISTANCE) & (free >= FREE_THRESHOLD)
+    if not candidates.any():
+        # Todo bloqueado: girar en el sitio hacia el lado con más espacio libre
+        half = NUM_SECTORS // 2
+        turn = CRUISING_SPEED * SLOWDOWN_FACTOR
+        return (-turn, turn) if free[:half].sum() >= free[-half:].sum() else (turn, -turn)
+
+    score = np.where(candidates, free - TURN_PENALTY * np.abs(sector_angles), -np.inf)
+    target_angle = sector_angles[np.argmax(score)]
+    # Se frena en proporción a lo cerca que esté lo que hay delante
+    ahead = sector_min[NUM_SECTORS // 2]
+    speed = CRUISING_SPEED * np.clip(ahead / RANGE_THRESHOLD, SLOWDOWN_FACTOR, 1.0)
+    turn = K_TURN * target_angle
+    left_speed = float(np.clip(speed - turn, -MAX_SPEED, MAX_SPEED))
+    right_speed = float(np.clip(speed + turn, -MAX_SPEED, MAX_SPEED))
+    return left_speed, right_speed
 
 # --- Bucle principal ---
 while robot.step(time_step) != -1:
-    # Obtener valores del rango (distancias en metros)
-    depth_image = kinect_range.getRangeImage()
-
-    left_sum = 0.0
-    right_sum = 0.0
-
-    # Revisamos cada columna de la mitad izquierda y derecha
-    for i in range(half_width):
-        left_val = kinect_range.rangeImageGetDepth(depth_image, width, i, mid_height)
-        right_val = kinect_range.rangeImageGetDepth(depth_image, width, width - i - 1, mid_height)
-
-        if left_val < RANGE_THRESHOLD:
-            left_sum += left_val
-        if right_val < RANGE_THRESHOLD:
-            right_sum += right_val
-
-    # Velocidades base
-    left_speed = CRUISING_SPEED
-    right_speed = CRUISING_SPEED
-
-    # Lógica: si hay más obstáculo en un lado → giramos hacia el otro
-    if left_sum > right_sum and left_sum > 0:
-        left_speed = SLOWDOWN_FACTOR * CRUISING_SPEED
-        right_speed = CRUISING_SPEED
-    elif right_sum > left_sum and right_sum > 0:
-        left_speed = CRUISING_SPEED
-        right_speed = SLOWDOWN_FACTOR * CRUISING_SPEED
+    # Un puñado de operaciones sobre arrays por paso, sea cual sea la resolución del Kinect
+    sector_min, free = sector_histograms(read_depth())
+    left_speed, right_speed = steer(sector_min, free)
 
     # Aplicar velocidades
     left_wheel.setVelocity(left_speed)
@@ -0,0 +1,236 @@
+# BatchSimulatedRobot.py
+
+import argparse
+import math
+import time
+import numpy as np
+
+SEARCHING, NAVIGATING_TO_GNOME, NAVIGATING_TO_DROPOFF, RETURNING_HOME, CHARGING, FINISHED = range(6)
+STATE_NAMES = ['SEARCHING', 'NAVIGATING_TO_GNOME', 'NAVIGATING_TO_DROPOFF', 'RETURNING_HOME', 'CHARGING', 'FINISHED']
+HOME = (0.5, 0.5)
+
+def random_gnomes(config, num_robots, rng, width=10.0, height=10.0):
+    """Un mundo por robot, con la misma distribución que World.reset()."""
+    xs = rng.uniform(1.0, width - 1.0, (num_robots, config["num_gnomes"]))
+    ys = rng.uniform(1.0, height - 1.0, (num_robots, config["num_gnomes"]))
+    return np.stack([xs, ys], axis=-1)
+
+class BatchSimulatedRobot:
+    """N robots de SimulatedRobot avanzados a la vez con operaciones sobre arrays.
+
+    Cada robot tiene su propio mundo (gnomes[i]). La lógica replica paso a paso
+    SimulatedRobot.update(): primero _update_logic y luego la física y batería.
+    """
+    def __init__(self, config, gnomes):
+        self.config = config
+        self.gnomes = np.asarray(gnomes, dtype=float)
+        self.num_robots, self.num_gnomes = self.gnomes.shape[:2]
+        # Pares de gnomos cercanos en cada mundo: sustituyen a las búsquedas con math.dist
+        pair_dist = np.linalg.norm(self.gnomes[:, :, None, :] - self.gnomes[:, None, :, :], axis=-1)
+        self.near_targeted = pair_dist < 0.5
+        self.near_picked = pair_dist <= 0.1
+        self.patrol_points = np.array(self._generate_patrol_points())
+        self.reset()
+
+    def _generate_patrol_points(self, step=1.5):
+        points, margin, x, direction = [], step/2.0, step/2.0, 1
+        while x < 10.0:
+            y1, y2 = (margin, 10.0 - margin) if direction == 1 else (10.0 - margin, margin)
+            points.extend([(x, y1), (x, y2)])
+            direction *= -1
+            x += step
+        return points
+
+    def reset(self):
+        """Resetea el estado de todos los robots a su condición inicial."""
+        n = self.num_robots
+        self.x, self.y, self.theta = np.full(n, 0.5), np.full(n, 0.5), np.zeros(n)
+        self.linear_velocity, self.angular_velocity = np.zeros(n), np.zeros(n)
+        self.camera_fov_rad = math.radians(self.config["camera_fov_degrees"])
+        self.camera_range = self.config["camera_range"]
+        self.battery = np.full(n, float(self.config["battery_capacity"]))
+        self.state = np.full(n, SEARCHING, dtype=np.int8)
+        self.gnome_alive = np.ones((n, self.num_gnomes), dtype=bool)
+        self.targeted = np.zeros((n, self.num_gnomes), dtype=bool)
+        self.inventory, self.delivered = np.zeros(n, dtype=int), np.zeros(n, dtype=int)
+        self.target_index = np.zeros(n, dtype=int)
+        # Un objetivo es (x, y, ¿existe?, índice de gnomo o -1), igual para los guardados
+        self.target = self._empty_target()
+        self.saved_state = np.full(n, SEARCHING, dtype=np.int8)
+        self.saved_target = self._empty_target()
+        self.saved_patrol_index = np.zeros(n, dtype=int)
+        self.saved_patrol_target = self._empty_target()
+
+    def _empty_target(self):
+        n = self.num_robots
+        return {"x": np.zeros(n), "y": np.zeros(n), "set": np.zeros(n, dtype=bool), "gnome": np.full(n, -1)}
+
+    @staticmethod
+    def _copy_target(dst, src, mask):
+        for key in dst: dst[key][mask] = src[key][mask]
+
+    def _set_target(self, mask, x, y, gnome=-1):
+        self.target["x"][mask], self.target["y"][mask] = x, y
+        self.target["set"][mask], self.target["gnome"][mask] = True, gnome
+
+    @property
+    def state_names(self):
+        return [STATE_NAMES[s] for s in self.state]
+
+    def update(self, dt):
+        self._update_logic()
+        self._update_physics_and_battery(dt)
+
+    def _update_physics_and_battery(self, dt):
+        drain = np.full(self.num_robots, self.config["drain_base"] * dt)
+        drain = drain + np.where(self.linear_velocity > 0.01, self.config["drain_move"] * dt, 0.0)
+        drain = drain + np.where(np.abs(self.angular_velocity) > 0.01, self.config["drain_turn"] * dt, 0.0)
+        self.battery = np.maximum(0, self.battery - drain)
+
+        theta = self.theta + self.angular_velocity * dt
+        theta = np.arctan2(np.sin(theta), np.cos(theta))
+        # Ajusta el ángulo a 90° exactos cuando casi no hay giro
+        snap = np.abs(self.angular_velocity) < 0.1
+        self.theta = np.where(snap, np.round(theta / (math.pi / 2)) * (math.pi / 2), theta)
+
+        self.x = self.x + self.linear_velocity * np.cos(self.theta) * dt
+        self.y = self.y + self.linear_velocity * np.sin(self.theta) * dt
+
+    def _update_vision(self, mask):
+        """Índice del primer gnomo visible y no marcado para cada robot (o -1)."""
+        dx = self.gnomes[:, :, 0] - self.x[:, None]
+        dy = self.gnomes[:, :, 1] - self.y[:, None]
+        already_targeted = (self.near_targeted & self.targeted[:, None, :]).any(axis=-1)
+        angle_diff = np.mod(np.arctan2(dy, dx) - self.theta[:, None] + math.pi, 2 * math.pi) - math.pi
+        visible = (self.gnome_alive & ~already_targeted & (np.sqrt(dx**2 + dy**2) <= self.camera_range)
+                   & (np.abs(angle_diff) <= self.camera_fov_rad / 2.0) & mask[:, None])
+        return np.where(visible.any(axis=1), visible.argmax(axis=1), -1)
+
+    def _navigate_grid_style(self, mask):
+        dx, dy = self.target["x"] - self.x, self.target["y"] - self.y
+        dist = np.sqrt(dx**2 + dy**2)
+        align_tol = 0.1
+        # Prioriza el eje X; solo si ya está alineado en X se enfoca en el eje Y
+        target_angle = np.where(np.abs(dx) > align_tol, np.where(dx > 0, 0.0, math.pi),
+                                np.where(np.abs(dy) > align_tol, np.where(dy > 0, math.pi/2, -math.pi/2), self.theta))
+        angle_diff = np.mod(target_angle - self.theta + math.pi, 2 * math.pi) - math.pi
+        turning = np.abs(angle_diff) > 0.05
+        linear = np.where(turning, 0.0, self.config["robot_speed"] * np.minimum(1.0, dist / 0.5))
+        angular = np.where(turning, self.config["Kp_turn"] * angle_diff, 0.0)
+        has_target = self.target["set"]
+        self.linear_velocity = np.where(mask, np.where(has_target, linear, 0.0), self.linear_velocity)
+        self.angular_velocity = np.where(mask, np.where(has_target, angular, 0.0), self.angular_velocity)
+
+    def _update_logic(self):
+        cfg = self.config
+        low = (self.battery <= cfg["battery_low_threshold"]) & (self.state != RETURNING_HOME) & (self.state != CHARGING)
+        self.saved_state[low] = self.state[low]
+        self._copy_target(self.saved_target, self.target, low)
+        self._set_target(low, *HOME)
+        self.state[low] = RETURNING_HOME
+
+        state = self.state.copy()
+        self._navigate_grid_style(state <= RETURNING_HOME)
+        dist_to_target = np.sqrt((self.x - self.target["x"])**2 + (self.y - self.target["y"])**2)
+        at_target = self.target["set"] & (dist_to_target < 0.3)
+
+        # --- SEARCHING ---
+        searching = state == SEARCHING
+        found = self._update_vision(searching)
+        got = found >= 0
+        robots = np.nonzero(got)[0]
+        self.targeted[robots, found[got]] = True
+        self.saved_patrol_index[got] = self.target_index[got]
+        self._copy_target(self.saved_patrol_target, self.target, got)
+        self._set_target(got, self.gnomes[robots, found[got], 0], self.gnomes[robots, found[got], 1], found[got])
+        self.state[got] = NAVIGATING_TO_GNOME
+
+        patrolling = searching & ~got
+        num_patrol = len(self.patrol_points)
+        next_point = patrolling & ~self.target["set"] & (self.target_index < num_patrol)
+        idx = self.target_index[next_point]
+        self._set_target(next_point, self.patrol_points[idx, 0], self.patrol_points[idx, 1])
+        reached = patrolling & ~next_point & at_target
+        self.target_index[reached] += 1
+        self.target["set"][reached], self.target["gnome"][reached] = False, -1
+        self.state[reached & (self.target_index >= num_patrol)] = FINISHED
+
+        # --- NAVIGATING_TO_GNOME ---
+        pickup = (state == NAVIGATING_TO_GNOME) & at_target
+        robots = np.nonzero(pickup)[0]
+        gnome = self.target["gnome"][pickup]
+        self.gnome_alive[robots, gnome] = False
+        self.targeted[robots] &= ~self.near_picked[robots, gnome]
+        self.inventory[pickup] += 1
+        self._set_target(pickup, *HOME)
+        self.state[pickup] = NAVIGATING_TO_DROPOFF
+
+        # --- NAVIGATING_TO_DROPOFF ---
+        dropoff = (state == NAVIGATING_TO_DROPOFF) & at_target
+        self.inventory[dropoff] -= 1
+        self.delivered[dropoff] += 1
+        self.target_index[dropoff] = self.saved_patrol_index[dropoff]
+        self._copy_target(self.target, self.saved_patrol_target, dropoff)
+        self.state[dropoff] = SEARCHING
+
+        # --- RETURNING_HOME ---
+        home = (state == RETURNING_HOME) & (np.sqrt((self.x - HOME[0])**2 + (self.y - HOME[1])**2) < 0.2)
+        self.linear_velocity[home], self.angular_velocity[home] = 0.0, 0.0
+        self.state[home] = CHARGING
+
+        # --- CHARGING ---
+        charging = state == CHARGING
+        self.battery[charging] += cfg["charge_rate"] * cfg["time_step"]
+        full = charging & (self.battery >= cfg["battery_capacity"])
+        self.battery[full] = cfg["battery_capacity"]
+        self.state[full] = self.saved_state[full]
+        self._copy_target(self.target, self.saved_target, full)
+
+        # --- FINISHED ---
+        finished = state == FINISHED
+        self.linear_velocity[finished], self.angular_velocity[finished] = 0.0, 0.0
+
+def compare_with_scalar(config, num_robots=20, steps=20000, seed=0, tol=1e-6):
+    """Simula los mismos mundos con SimulatedRobot y devuelve el error máximo de pose y batería."""
+    from SimulatedRobot import SimulatedRobot
+    from World import World
+
+    gnomes = random_gnomes(config, num_robots, np.random.default_rng(seed))
+    batch = BatchSimulatedRobot(config, gnomes)
+    worlds = [World(config, seed) for _ in range(num_robots)]
+    for world, world_gnomes in zip(worlds, gnomes):
+        world.set_gnomes([tuple(map(float, g)) for g in world_gnomes])
+    robots = [SimulatedRobot(config) for _ in range(num_robots)]
+    max_err, state_mismatches = 0.0, 0
+    for _ in range(steps):
+        batch.update(config["time_step"])
+        for robot, world in zip(robots, worlds):
+            robot.update(world, config["time_step"])
+        scalar = np.array([(r.x, r.y, r.theta, r.battery) for r in robots])
+        vector = np.stack([batch.x, batch.y, batch.theta, batch.battery], axis=1)
+        max_err = max(max_err, float(np.abs(scalar - vector).max()))
+        state_mismatches += sum(r.state != s for r, s in zip(robots, batch.state_names))
+    return max_err, state_mismatches, max_err <= tol and state_mismatches == 0
+
+def benchmark(config, num_robots, steps, seed=0):
+    batch = BatchSimulatedRobot(config, random_gnomes(config, num_robots, np.random.default_rng(seed)))
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.update(config["time_step"])
+    elapsed = time.perf_counter() - start
+    return elapsed / steps
+
+if __name__ == "__main__":
+    from SimulatedRobot import DEFAULT_CONFIG
+    parser = argparse.ArgumentParser(description="Simulador por lotes de SimulatedRobot con NumPy")
+    parser.add_argument("--robots", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--check-robots", type=int, default=20)
+    parser.add_argument("--check-steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    err, mismatches, ok = compare_with_scalar(DEFAULT_CONFIG, args.check_robots, args.check_steps)
+    print(f"Comparación con SimulatedRobot: error máximo {err:.2e}, estados distintos {mismatches} -> {'OK' if ok else 'FALLO'}")
+    for n in args.robots:
+        per_step = benchmark(DEFAULT_CONFIG, n, args.steps)
+        print(f"{n:>6} robots: {per_step * 1000:.2f} ms/paso ({n / per_step:,.0f} robot-pasos/s)")
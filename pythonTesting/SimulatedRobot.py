@@ -1,6 +1,14 @@
 # SimulatedRobot.py
 
 import math
+from SpatialHash import SpatialHash
+
+DEFAULT_CONFIG = {
+    "num_gnomes": 15, "robot_speed": 1.5, "Kp_turn": 4.0, "camera_fov_degrees": 70,
+    "battery_capacity": 100.0, "battery_low_threshold": 25.0, "time_step": 0.01,
+    "camera_range": 3.0, "drain_base": 0.1, "drain_move": 1.0, "drain_turn": 0.5, "charge_rate": 10.0,
+    "seed": None,  # None: semilla nueva en cada reinicio (queda guardada en world.seed)
+}
 
 class SimulatedRobot:
     """Encapsula toda la lógica, física y estado del robot."""
@@ -16,7 +24,7 @@ class SimulatedRobot:
         self.camera_range = self.config["camera_range"]
         self.battery = self.config["battery_capacity"]
         self.state = 'SEARCHING'
-        self.targeted_gnomes = []
+        self.targeted_gnomes = SpatialHash(0.5)
         self.newly_discovered_gnomes = []
         self.inventory = []
         self.patrol_points = self._generate_patrol_points()
@@ -56,15 +64,15 @@ class SimulatedRobot:
         self.y += self.linear_velocity * math.sin(self.theta) * dt
     
     def _update_vision(self, world):
-        for gx, gy in world.gnomes:
-            is_already_targeted = any(math.dist((gx, gy), f) < 0.5 for f in self.targeted_gnomes)
-            if not is_already_targeted and math.dist((self.x, self.y), (gx, gy)) <= self.camera_range:
-                angle_to_gnome = math.atan2(gy - self.y, gx - self.x)
-                angle_diff = (angle_to_gnome - self.theta + math.pi) % (2 * math.pi) - math.pi
-                if abs(angle_diff) <= self.camera_fov_rad / 2.0:
-                    self.targeted_gnomes.append((gx, gy))
-                    self.newly_discovered_gnomes.append((gx, gy))
-                    return (gx, gy)
+        # Solo los gnomos al alcance de la cámara, en el mismo orden en que se recorría world.gnomes
+        for gx, gy in world.gnomes_near((self.x, self.y), self.camera_range):
+            if self.targeted_gnomes.any_within((gx, gy), 0.5): continue
+            angle_to_gnome = math.atan2(gy - self.y, gx - self.x)
+            angle_diff = (angle_to_gnome - self.theta + math.pi) % (2 * math.pi) - math.pi
+            if abs(angle_diff) <= self.camera_fov_rad / 2.0:
+                self.targeted_gnomes.insert((gx, gy))
+                self.newly_discovered_gnomes.append((gx, gy))
+                return (gx, gy)
         return None
     
     # --- CAMBIO CLAVE: Nuevo método de navegación en 90 grados ---
@@ -123,9 +131,9 @@ class SimulatedRobot:
                     self.state = 'FINISHED'
         
         elif self.state == 'NAVIGATING_TO_GNOME' and self.current_target and math.dist((self.x, self.y), self.current_target) < 0.3:
-            if self.current_target in world.gnomes:
-                world.gnomes.remove(self.current_target)
-            self.targeted_gnomes = [g for g in self.targeted_gnomes if math.dist(g, self.current_target) > 0.1]
+            world.remove_gnome(self.current_target)
+            for g, _ in self.targeted_gnomes.query(self.current_target, 0.1):
+                self.targeted_gnomes.remove(g)
             self.inventory.append(self.current_target)
             self.current_target, self.state = (0.5, 0.5), 'NAVIGATING_TO_DROPOFF'
         
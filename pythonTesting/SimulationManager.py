@@ -2,13 +2,8 @@ import math
 from vpython import *
 
 from World import World
-from SimulatedRobot import SimulatedRobot
-
-DEFAULT_CONFIG = {
-    "num_gnomes": 15, "robot_speed": 1.5, "Kp_turn": 4.0, "camera_fov_degrees": 70,
-    "battery_capacity": 100.0, "battery_low_threshold": 25.0, "time_step": 0.01,
-    "camera_range": 3.0, "drain_base": 0.1, "drain_move": 1.0, "drain_turn": 0.5, "charge_rate": 10.0,
-}
+from SimulatedRobot import SimulatedRobot, DEFAULT_CONFIG
+from SpatialHash import SpatialHash
 
 class SimulationManager:
     def __init__(self, config):
@@ -74,21 +69,22 @@ class SimulationManager:
         self.vpython_widgets["gnome_list"] = wtext(text="- Simulación no empezada -", append_to_element="#right-panel")
 
     def reset_simulation(self):
-        for key in ["gnomes", "robot"]:
-            if key in self.vpython_objects:
-                for obj in self.vpython_objects[key]:
-                    obj.visible = False
-                    del obj
-                self.vpython_objects[key] = []
+        if "gnomes" in self.vpython_objects:
+            for _, obj in self.vpython_objects["gnomes"].items():
+                obj.visible = False
+        if "robot" in self.vpython_objects:
+            for obj in self.vpython_objects["robot"]:
+                obj.visible = False
+            self.vpython_objects["robot"] = []
         
-        self.world = World(self.config)
+        self.world = World(self.config, self.config.get("seed"))
         self.robot = SimulatedRobot(self.config)
         self.discovered_gnome_count = 0
 
-        self.vpython_objects["gnomes"] = [
-            cylinder(pos=vector(p[0], 0.2, p[1]), axis=vector(0, 0.4, 0), radius=0.15, color=color.red)
-            for p in self.world.gnomes
-        ]
+        # Cilindro de cada gnomo indexado por su posición para encontrarlo al recogerlo
+        self.vpython_objects["gnomes"] = SpatialHash(self.world.cell_size)
+        for p in self.world.gnomes:
+            self.vpython_objects["gnomes"].insert(p, cylinder(pos=vector(p[0], 0.2, p[1]), axis=vector(0, 0.4, 0), radius=0.15, color=color.red))
         r_body = compound([
             cylinder(axis=vector(0, 0.3, 0), radius=0.25, color=color.blue),
             arrow(pos=vector(0, 0.15, 0), axis=vector(0.3, 0, 0), color=color.white, shaftwidth=0.05)
@@ -99,7 +95,7 @@ class SimulationManager:
         self.vpython_objects["gnome_dots"].data = []
         self.vpython_objects["robot_path_curve"].data = []
         self.vpython_widgets["gnome_list"].text = "- Ningún gnomo detectado aún -"
-        self.vpython_objects["label_status"].text = "Listo para buscar..."
+        self.vpython_objects["label_status"].text = f"Listo para buscar... (semilla {self.world.seed})"
         self.update_visuals()
 
     def update_visuals(self):
@@ -145,24 +141,15 @@ class SimulationManager:
             if not self.simulation_running:
                 continue
 
-            gnomes_before = set(self.world.gnomes)
             self.robot.update(self.world, self.config["time_step"])
-            gnomes_after = set(self.world.gnomes)
 
             self.update_visuals()
             self._update_map_and_lists()
             
-            removed_gnomes = gnomes_before - gnomes_after
-            if removed_gnomes:
-                rem_pos = removed_gnomes.pop()
-                rem_obj = None
-                for obj in self.vpython_objects["gnomes"]:
-                    if obj.pos.x == rem_pos[0] and obj.pos.z == rem_pos[1]:
-                        rem_obj = obj; break
-                if rem_obj:
-                    rem_obj.visible = False
-                    self.vpython_objects["gnomes"].remove(rem_obj)
-                    del rem_obj
+            for rem_pos in self.world.removed_gnomes:
+                if rem_pos in self.vpython_objects["gnomes"]:
+                    self.vpython_objects["gnomes"].remove(rem_pos).visible = False
+            self.world.removed_gnomes.clear()
 
             if self.robot.state == 'FINISHED' or self.robot.battery <= 0:
                 self.simulation_running = False
@@ -0,0 +1,94 @@
+# SpatialHash.py
+
+import math
+
+class SpatialHash:
+    """Rejilla uniforme de cubetas para puntos 2D.
+
+    Cada punto (x, y) vive en la cubeta (floor(x/cell_size), floor(y/cell_size)),
+    así que una consulta de radio r solo mira las cubetas que toca el círculo:
+    O(1) esperado si cell_size es del orden de los radios que se consultan.
+    Cada punto guarda un item asociado (un índice, un objeto de VPython...).
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+        self.bounds = None  # (cx_min, cy_min, cx_max, cy_max) de las cubetas usadas; solo crece
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, point):
+        return point in self.cells.get(self._cell(*point), ())
+
+    def items(self):
+        for bucket in self.cells.values():
+            yield from bucket.items()
+
+    def insert(self, point, item=None):
+        point = tuple(point)
+        cell = self._cell(*point)
+        bucket = self.cells.setdefault(cell, {})
+        if point not in bucket: self.count += 1
+        bucket[point] = item
+        if self.bounds is None: self.bounds = cell + cell
+        else:
+            x0, y0, x1, y1 = self.bounds
+            self.bounds = (min(x0, cell[0]), min(y0, cell[1]), max(x1, cell[0]), max(y1, cell[1]))
+
+    def remove(self, point):
+        """Quita el punto exacto y devuelve su item (KeyError si no está)."""
+        cell = self._cell(*point)
+        bucket = self.cells[cell]
+        item = bucket.pop(tuple(point))
+        if not bucket: del self.cells[cell]
+        self.count -= 1
+        return item
+
+    def _buckets_in_radius(self, x, y, radius):
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # Radio enorme frente a lo poblado: es más barato recorrer las cubetas existentes
+            return [b for (cx, cy), b in self.cells.items() if cx0 <= cx <= cx1 and cy0 <= cy <= cy1]
+        cells = self.cells
+        return [cells[(cx, cy)] for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1) if (cx, cy) in cells]
+
+    def query(self, point, radius):
+        """Lista de (punto, item) a distancia <= radius."""
+        x, y = point
+        return [(p, item) for bucket in self._buckets_in_radius(x, y, radius)
+                for p, item in bucket.items() if math.dist(point, p) <= radius]
+
+    def any_within(self, point, radius):
+        """True si hay algún punto a distancia estrictamente menor que radius (para descartar duplicados)."""
+        x, y = point
+        for bucket in self._buckets_in_radius(x, y, radius):
+            for p in bucket:
+                if math.dist(point, p) < radius: return True
+        return False
+
+    def nearest(self, point, max_distance=math.inf):
+        """(punto, item) más cercano a point, o None si no hay ninguno a <= max_distance."""
+        if not self.count: return None
+        x, y = point
+        cx, cy = self._cell(x, y)
+        x0, y0, x1, y1 = self.bounds
+        # Anillos de cubetas alrededor de la del punto hasta cubrir todas las usadas
+        max_ring = max(abs(cx - x0), abs(cx - x1), abs(cy - y0), abs(cy - y1))
+        if max_distance != math.inf: max_ring = min(max_ring, math.ceil(max_distance / self.cell_size))
+        best, best_dist = None, max_distance
+        for ring in range(max_ring + 1):
+            # Cualquier punto de este anillo está a más de (ring - 1) * cell_size
+            if best is not None and best_dist <= (ring - 1) * self.cell_size: break
+            for i in range(cx - ring, cx + ring + 1):
+                for j in range(cy - ring, cy + ring + 1):
+                    if ring and abs(i - cx) != ring and abs(j - cy) != ring: continue
+                    for p, item in self.cells.get((i, j), {}).items():
+                        d = math.dist(point, p)
+                        if d <= best_dist: best, best_dist = (p, item), d
+        return best
@@ -1,16 +1,42 @@
-from vpython import *
 import random
+from SpatialHash import SpatialHash
 
 
 class World:
-    def __init__(self, config):
+    def __init__(self, config, seed=None, rng=None):
+        # Generador propio por simulación: el mundo se reproduce con la misma semilla
+        # y varias simulaciones a la vez no comparten el estado del módulo random
+        if seed is None and rng is None: seed = random.SystemRandom().randrange(2**32)
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
         self.width = 10.0
         self.height = 10.0
         self.num_gnomes = config["num_gnomes"]
-        self.gnomes = []
+        # Cubetas del tamaño del alcance de la cámara: una consulta de visión mira como mucho 3x3
+        self.cell_size = config.get("camera_range", 3.0)
+        self.gnomes = {}
         self.reset()
 
     def reset(self):
+        self.set_gnomes([(self.rng.uniform(1.0, self.width - 1.0), self.rng.uniform(1.0, self.height - 1.0))
+                         for _ in range(self.num_gnomes)])
 
-        self.gnomes = [(random.uniform(1.0, self.width - 1.0), random.uniform(1.0, self.height - 1.0)) 
-                       for _ in range(self.num_gnomes)]
\ No newline at end of file
+    def set_gnomes(self, gnomes):
+        # gnomes: posición -> orden de creación (el dict conserva el orden al iterar)
+        self.gnomes = {}
+        self.gnome_index = SpatialHash(self.cell_size)
+        self.removed_gnomes = []
+        for order, pos in enumerate(gnomes):
+            self.gnomes[pos] = order
+            self.gnome_index.insert(pos, order)
+
+    def gnomes_near(self, pos, radius):
+        """Gnomos a distancia <= radius, en el orden en que se crearon."""
+        return [p for p, _ in sorted(self.gnome_index.query(pos, radius), key=lambda entry: entry[1])]
+
+    def remove_gnome(self, pos):
+        if pos not in self.gnomes: return False
+        del self.gnomes[pos]
+        self.gnome_index.remove(pos)
+        self.removed_gnomes.append(pos)
+        return True
@@ -0,0 +1,2 @@
+# Micro-benchmarks de las rutas calientes de discreteWorld.
+# Se ejecutan desde pythonTesting/discreteWorld, p. ej.: python -m benchmarks.astar
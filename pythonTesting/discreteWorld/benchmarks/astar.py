@@ -0,0 +1,104 @@
+# benchmarks/astar.py
+# Compara find_path_astar con la implementación anterior (Node + búsqueda lineal en el heap).
+import argparse
+import heapq
+import random
+import time
+from constants import CONFIG, MEM_UNKNOWN, MEM_EMPTY, MEM_OBSTACLE, MEM_SLOW
+from utils import find_path_astar
+from grid import Grid
+
+class LegacyNode:
+    def __init__(self, position, parent=None):
+        self.position, self.parent = position, parent
+        self.g, self.h, self.f = 0, 0, 0
+    def __eq__(self, other): return self.position == other.position
+    def __lt__(self, other): return self.f < other.f
+
+def legacy_find_path_astar(memory_grid, start, end):
+    start_node, end_node = LegacyNode(start), LegacyNode(end)
+    open_list, closed_list = [], set()
+    heapq.heappush(open_list, start_node)
+    while open_list:
+        current_node = heapq.heappop(open_list)
+        closed_list.add(current_node.position)
+        if current_node == end_node:
+            path = []
+            current = current_node
+            while current is not None:
+                path.append(current.position)
+                current = current.parent
+            return path[::-1]
+        (r, c) = current_node.position
+        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            neighbor_pos = (r + dr, c + dc)
+            if not (0 <= neighbor_pos[0] < CONFIG['GRID_HEIGHT'] and 0 <= neighbor_pos[1] < CONFIG['GRID_WIDTH']) or \
+               memory_grid[neighbor_pos[0]][neighbor_pos[1]] in [MEM_OBSTACLE, MEM_UNKNOWN] or \
+               neighbor_pos in closed_list:
+                continue
+            cost = CONFIG["cost_slow_cell"] if memory_grid[neighbor_pos[0]][neighbor_pos[1]] == MEM_SLOW else 1
+            neighbor_node = LegacyNode(neighbor_pos, current_node)
+            neighbor_node.g = current_node.g + cost
+            neighbor_node.h = abs(neighbor_pos[0] - end_node.position[0]) + abs(neighbor_pos[1] - end_node.position[1])
+            neighbor_node.f = neighbor_node.g + neighbor_node.h
+            if any(n for n in open_list if neighbor_node == n and neighbor_node.g >= n.g):
+                continue
+            heapq.heappush(open_list, neighbor_node)
+    return None
+
+def make_memory_grid(size, rng, p_obstacle=0.2, p_slow=0.2, p_unknown=0.1):
+    grid = []
+    for _ in range(size):
+        row = []
+        for _ in range(size):
+            x = rng.random()
+            if x < p_obstacle: row.append(MEM_OBSTACLE)
+            elif x < p_obstacle + p_slow: row.append(MEM_SLOW)
+            elif x < p_obstacle + p_slow + p_unknown: row.append(MEM_UNKNOWN)
+            else: row.append(MEM_EMPTY)
+        grid.append(row)
+    return Grid.from_rows(grid)
+
+def path_cost(memory_grid, path):
+    if path is None: return None
+    return sum(CONFIG["cost_slow_cell"] if memory_grid[r, c] == MEM_SLOW else 1 for r, c in path[1:])
+
+def make_queries(grid, rng, count):
+    free = [(r, c) for r, row in enumerate(grid.tolist()) for c, v in enumerate(row) if v in (MEM_EMPTY, MEM_SLOW)]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+def time_searches(fn, grid, queries, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for start, end in queries:
+            fn(grid, start, end)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de A* (nuevo vs. anterior)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 200])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    saved = CONFIG['GRID_WIDTH'], CONFIG['GRID_HEIGHT']
+    print(f"{'grid':>9} {'anterior (ms)':>14} {'nuevo (ms)':>11} {'speedup':>8} {'costes iguales':>15}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        grid = make_memory_grid(size, rng)
+        queries = make_queries(grid, rng, args.queries)
+        # La versión anterior trabajaba sobre listas de listas
+        rows = grid.tolist()
+        CONFIG['GRID_WIDTH'], CONFIG['GRID_HEIGHT'] = size, size
+        same = sum(path_cost(grid, legacy_find_path_astar(rows, s, e)) == path_cost(grid, find_path_astar(grid, s, e))
+                   for s, e in queries)
+        old = time_searches(legacy_find_path_astar, rows, queries, args.repeat)
+        new = time_searches(find_path_astar, grid, queries, args.repeat)
+        print(f"{size:>4}x{size:<4} {old * 1000:>14.3f} {new * 1000:>11.3f} {old / new:>7.1f}x {same:>9}/{len(queries)}")
+    CONFIG['GRID_WIDTH'], CONFIG['GRID_HEIGHT'] = saved
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/exploration.py
+# Tiempo hasta cubrir el mapa: exploración por fronteras frente a la patrulla en serpentina.
+import argparse
+import statistics
+import time
+import numpy as np
+from constants import CONFIG, MEM_UNKNOWN
+from world import World, SimulatedRobot
+
+def run(config, seed, dt, max_time, target_coverage):
+    world, robot = World(config, seed), SimulatedRobot(config, publish=False)
+    # Cuántas veces se planifica un camino
+    plans, plan_path = [0], robot.plan_path
+    def counted_plan_path(goal):
+        plans[0] += 1
+        return plan_path(goal)
+    robot.plan_path = counted_plan_path
+
+    cells = robot.memory_grid.array.size
+    steps, max_steps, time_to_target = 0, int(max_time / dt), None
+    start = time.perf_counter()
+    while steps < max_steps and robot.state != 'TERMINADO' and robot.battery > 0:
+        robot.update(world, dt)
+        steps += 1
+        if time_to_target is None and robot.changed_cells:
+            known = cells - np.count_nonzero(robot.memory_grid.array == MEM_UNKNOWN)
+            if known >= target_coverage * cells: time_to_target = steps * dt
+    known = cells - np.count_nonzero(robot.memory_grid.array == MEM_UNKNOWN)
+    return {"time": steps * dt, "coverage": known / cells, "time_to_target": time_to_target,
+            "plans": plans[0], "delivered": robot.delivered, "wall_time": time.perf_counter() - start}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de exploración")
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--gnomes", type=int, default=0, help="gnomos en el mundo (0 = solo explorar)")
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--coverage", type=float, default=0.9, help="fracción del mapa para medir el tiempo")
+    parser.add_argument("--dt", type=float, default=1/60)
+    parser.add_argument("--max-time", type=float, default=7200.0)
+    args = parser.parse_args()
+
+    base = {**CONFIG, "GRID_WIDTH": args.size, "GRID_HEIGHT": args.size, "num_gnomes": args.gnomes}
+    print(f"{'modo':>9} {'t misión (s)':>13} {f't {args.coverage:.0%} (s)':>10} {'cobertura':>10} "
+          f"{'planes':>7} {'entregados':>11} {'tiempo (s)':>10}")
+    for mode in ("patrol", "frontier"):
+        config = {**base, "exploration": mode}
+        results = [run(config, seed, args.dt, args.max_time, args.coverage) for seed in range(args.seeds)]
+        reached = [r["time_to_target"] for r in results if r["time_to_target"] is not None]
+        to_target = f"{statistics.mean(reached):.1f}" if len(reached) == len(results) else "-"
+        print(f"{mode:>9} {statistics.mean(r['time'] for r in results):>13.1f} {to_target:>10} "
+              f"{statistics.mean(r['coverage'] for r in results):>10.1%} {statistics.mean(r['plans'] for r in results):>7.0f} "
+              f"{sum(r['delivered'] for r in results):>11} {statistics.mean(r['wall_time'] for r in results):>10.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+# benchmarks/fleet.py
+# Ritmo de entrega de gnomos y coste por tick de la flota con 1, 4 y 16 robots.
+import argparse
+import statistics
+from fleet import run_fleet
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la flota")
+    parser.add_argument("--robots", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--gnomes", type=int, default=30)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--dt", type=float, default=1/60)
+    parser.add_argument("--max-time", type=float, default=3600.0)
+    args = parser.parse_args()
+
+    config = {"GRID_WIDTH": args.size, "GRID_HEIGHT": args.size, "num_gnomes": args.gnomes}
+    print(f"{'robots':>6} {'t misión (s)':>13} {'entregados':>11} {'gnomos/min':>11} {'ms/tick':>8} {'ms/tick/robot':>14}")
+    for robots in args.robots:
+        results = [run_fleet(config, robots, dt=args.dt, max_time=args.max_time, seed=seed) for seed in range(args.seeds)]
+        ms_per_tick = statistics.mean(r["ms_per_tick"] for r in results)
+        print(f"{robots:>6} {statistics.mean(r['mission_time'] for r in results):>13.1f} "
+              f"{sum(r['gnomes_delivered'] for r in results):>5}/{sum(r['gnomes_total'] for r in results):<5} "
+              f"{statistics.mean(r['delivery_rate'] for r in results):>11.2f} {ms_per_tick:>8.3f} {ms_per_tick / robots:>14.3f}")
+
+if __name__ == '__main__':
+    main()
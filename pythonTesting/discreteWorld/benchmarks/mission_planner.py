@@ -0,0 +1,47 @@
+# benchmarks/mission_planner.py
+# Misiones completas con el plan de viajes ('tour') frente a la elección voraz ('greedy').
+import argparse
+import statistics
+import time
+from constants import CONFIG
+from world import World, SimulatedRobot
+
+def run(config, seed, dt, max_time):
+    world, robot = World(config, seed), SimulatedRobot(config, publish=False)
+    gnomes_total = len(world.gnomes)
+    steps, energy, max_steps = 0, 0.0, int(max_time / dt)
+    start = time.perf_counter()
+    while steps < max_steps and robot.state != 'TERMINADO' and robot.battery > 0:
+        before = robot.battery
+        robot.update(world, dt)
+        # La batería solo baja al gastar; la carga en la base no cuenta
+        energy += max(0.0, before - robot.battery)
+        steps += 1
+    return {"steps": steps, "energy": energy, "delivered": robot.delivered, "total": gnomes_total,
+            "wall_time": time.perf_counter() - start}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del planificador de misión")
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--gnomes", type=int, default=15)
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--capacity", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--dt", type=float, default=1/60)
+    parser.add_argument("--max-time", type=float, default=7200.0)
+    args = parser.parse_args()
+
+    base = {**CONFIG, "GRID_WIDTH": args.size, "GRID_HEIGHT": args.size, "num_gnomes": args.gnomes}
+    modes = [("greedy", 1)] + [("tour", capacity) for capacity in args.capacity]
+    print(f"{'modo':>10} {'cap':>4} {'pasos':>9} {'energía/gnomo':>14} {'entregados':>11} {'tiempo (s)':>10}")
+    for mode, capacity in modes:
+        config = {**base, "mission_planner": mode, "robot_capacity": capacity}
+        results = [run(config, seed, args.dt, args.max_time) for seed in range(args.seeds)]
+        delivered = sum(r["delivered"] for r in results)
+        total = sum(r["total"] for r in results)
+        steps = statistics.mean(r["steps"] for r in results)
+        per_gnome = sum(r["energy"] for r in results) / delivered if delivered else float('inf')
+        wall = statistics.mean(r["wall_time"] for r in results)
+        print(f"{mode:>10} {capacity:>4} {steps:>9.0f} {per_gnome:>14.2f} {delivered:>5}/{total:<5} {wall:>10.3f}")
+
+if __name__ == '__main__':
+    main()
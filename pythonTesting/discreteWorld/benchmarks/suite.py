@@ -0,0 +1,220 @@
+# benchmarks/suite.py
+# Suite de las rutas calientes de discreteWorld sobre escenarios sembrados: ops/s con su
+# dispersión, resultados en JSON y comparación con una línea base guardada.
+#   python -m benchmarks.suite --out resultados.json
+#   python -m benchmarks.suite --baseline resultados.json --only astar los
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+from constants import CONFIG
+from world import World, SimulatedRobot
+from publisher import MapPublisher
+from headless import run_mission
+from benchmarks.astar import make_memory_grid, make_queries
+
+# --- ESCENARIOS ---
+# Cada escenario recibe la semilla y devuelve la operación a cronometrar (sin argumentos)
+def astar_scenario(size, density, batch=50):
+    def setup(seed):
+        from utils import find_path_astar
+        rng = random.Random(seed)
+        grid = make_memory_grid(size, rng, p_obstacle=density)
+        queries = make_queries(grid, rng, batch)
+        slow_cost = CONFIG["cost_slow_cell"]
+        def op():
+            # Una operación es el lote entero: las consultas cuestan muy distinto, y si cada ronda
+            # cronometrara un subconjunto diferente la dispersión taparía cualquier regresión
+            for start, goal in queries: find_path_astar(grid, start, goal, slow_cost)
+        return op
+    return setup
+
+def make_robot(size, seed, poses=500):
+    config = {**CONFIG, "GRID_WIDTH": size, "GRID_HEIGHT": size}
+    world, robot = World(config, seed), SimulatedRobot(config, publish=False)
+    rng = random.Random(seed)
+    headings = list(robot.view_pattern.keys())
+    return world, robot, itertools.cycle([(rng.randrange(size), rng.randrange(size), rng.choice(headings)) for _ in range(poses)])
+
+def los_scenario(size):
+    def setup(seed):
+        world, robot, poses = make_robot(size, seed)
+        def op():
+            # Pose nueva en cada llamada: se mide el recorrido completo del cono, no la caché
+            robot.row, robot.col, robot.theta = next(poses)
+            robot.update_memory_with_los(world)
+        return op
+    return setup
+
+def scan_scenario(size):
+    def setup(seed):
+        world, robot, poses = make_robot(size, seed)
+        def op():
+            robot.row, robot.col, robot.theta = next(poses)
+            robot.scan_for_gnomes(world)
+        return op
+    return setup
+
+def worldgen_scenario(size):
+    def setup(seed):
+        world = World({**CONFIG, "GRID_WIDTH": size, "GRID_HEIGHT": size,
+                       "num_obstacles": size * size // 6, "num_slow_cells": size * size // 8}, seed)
+        return world.generate_world_elements
+    return setup
+
+def mapdata_scenario(size, encode=MapPublisher.snapshot_json):
+    def setup(seed):
+        config = {**CONFIG, "GRID_WIDTH": size, "GRID_HEIGHT": size}
+        world, robot = World(config, seed), SimulatedRobot(config, publish=False)
+        robot.memory_grid.array[:] = world.grid.array
+        publisher, grid = MapPublisher(), robot.memory_grid
+        publisher.publish(grid, (0, 0), set())
+        cells = itertools.cycle(np.argwhere(grid.array == 0).tolist()[:100])
+        def op():
+            # Versión nueva -> instantánea congelada -> cuerpo de /mapdata (JSON) o /mapdata.bin
+            r, c = next(cells)
+            grid[r, c] = 4 - grid[r, c]
+            publisher.publish(grid, (r, c), {(r, c)})
+            publisher.latest_snapshot()
+            publisher.publish(grid, (r, c), set())
+            encode(publisher)
+        return op
+    return setup
+
+def mission_scenario(size):
+    def setup(seed):
+        # Siempre la misma misión: mismo mundo y mismas decisiones en cada operación
+        return lambda: run_mission({"GRID_WIDTH": size, "GRID_HEIGHT": size}, seed=seed)
+    return setup
+
+def draw_scenario(size):
+    def setup(seed):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from constants import CELL_SIZE, COLOR_BG
+        from drawing import draw_world, draw_grid
+        world = World({**CONFIG, "GRID_WIDTH": size, "GRID_HEIGHT": size}, seed)
+        surface = pygame.Surface((size * CELL_SIZE, size * CELL_SIZE))
+        def op():
+            surface.fill(COLOR_BG)
+            draw_world(surface, world)
+            draw_grid(surface, size * CELL_SIZE, size * CELL_SIZE)
+        return op
+    return setup
+
+SCENARIOS = {
+    "astar50/30x30/obst0.20": astar_scenario(30, 0.2),
+    "astar50/100x100/obst0.20": astar_scenario(100, 0.2),
+    "astar50/100x100/obst0.35": astar_scenario(100, 0.35),
+    "astar50/200x200/obst0.20": astar_scenario(200, 0.2),
+    "los/30x30": los_scenario(30),
+    "scan_gnomes/30x30": scan_scenario(30),
+    "worldgen/30x30": worldgen_scenario(30),
+    "worldgen/200x200": worldgen_scenario(200),
+    "mapdata_json/30x30": mapdata_scenario(30),
+    "mapdata_json/100x100": mapdata_scenario(100),
+    "mapdata_bin/100x100": mapdata_scenario(100, MapPublisher.snapshot_binary),
+    "mapdata_rle/100x100": mapdata_scenario(100, lambda publisher: publisher.snapshot_binary(rle=True)),
+    "mapdata_rle/500x500": mapdata_scenario(500, lambda publisher: publisher.snapshot_binary(rle=True)),
+    "mission/10x10": mission_scenario(10),
+    "draw_world/30x30": draw_scenario(30),
+}
+
+# --- MEDICIÓN ---
+def calibrate(op, min_time):
+    # Como timeit.autorange: operaciones por ronda hasta que una ronda dure al menos min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number): op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time: return number
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed > 0 else number * 10
+
+def measure(op, rounds, min_time):
+    number = calibrate(op, min_time)
+    rates = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number): op()
+        rates.append(number / (time.perf_counter() - start))
+    mean = statistics.mean(rates)
+    stdev = statistics.stdev(rates) if len(rates) > 1 else 0.0
+    return {"ops_per_sec": mean, "stdev": stdev, "rel_stdev": stdev / mean if mean else 0.0,
+            "min": min(rates), "max": max(rates), "rounds": rounds, "ops_per_round": number}
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": sys.version.split()[0], "numpy": np.__version__, "platform": platform.platform(),
+            "machine": platform.machine(), "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+# --- COMPARACIÓN ---
+def compare(results, baseline, tolerance):
+    """Filas (nombre, antes, ahora, cambio, veredicto); regresión si cae más que tolerance y que el ruido."""
+    rows = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, current["ops_per_sec"], None, "nuevo"))
+            continue
+        change = current["ops_per_sec"] / before["ops_per_sec"] - 1
+        # Ruido: dispersión relativa de ambas mediciones, sumada en cuadratura
+        noise = (current["rel_stdev"] ** 2 + before.get("rel_stdev", 0.0) ** 2) ** 0.5
+        if change < -max(tolerance, 2 * noise): verdict = "REGRESIÓN"
+        elif change > max(tolerance, 2 * noise): verdict = "mejora"
+        else: verdict = "igual"
+        rows.append((name, before["ops_per_sec"], current["ops_per_sec"], change, verdict))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de discreteWorld")
+    parser.add_argument("--only", nargs="+", default=None, help="solo escenarios cuyo nombre contenga alguno de estos textos")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="duración mínima de cada ronda en segundos")
+    parser.add_argument("--out", help="guarda los resultados en este JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="caída relativa tolerada antes de marcar regresión")
+    parser.add_argument("--list", action="store_true", help="lista los escenarios y sale")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return
+    names = [name for name in SCENARIOS if not args.only or any(text in name for text in args.only)]
+    results = {}
+    print(f"{'escenario':<26} {'ops/s':>12} {'± desv.':>10} {'desv. %':>8} {'ops/ronda':>10}")
+    for name in names:
+        stats = measure(SCENARIOS[name](args.seed), args.rounds, args.min_time)
+        results[name] = stats
+        print(f"{name:<26} {stats['ops_per_sec']:>12.1f} {stats['stdev']:>10.1f} "
+              f"{stats['rel_stdev'] * 100:>7.1f}% {stats['ops_per_round']:>10}")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({"environment": environment(), "seed": args.seed, "scenarios": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+        rows = compare(results, baseline, args.tolerance)
+        print(f"\n{'escenario':<26} {'base ops/s':>12} {'ops/s':>12} {'cambio':>8}  veredicto")
+        for name, before, now, change, verdict in rows:
+            before_text = f"{before:.1f}" if before is not None else "-"
+            change_text = f"{change * 100:+.1f}%" if change is not None else "-"
+            print(f"{name:<26} {before_text:>12} {now:>12.1f} {change_text:>8}  {verdict}")
+        if any(verdict == "REGRESIÓN" for *_, verdict in rows): sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/visibility.py
+# Coste por tick de update_memory_with_los frente al recorrido anterior con bresenham_line.
+import argparse
+import random
+import time
+from constants import CONFIG, MEM_OBSTACLE
+from utils import bresenham_line
+from world import World, SimulatedRobot
+
+def legacy_update_memory_with_los(robot, world, memory_rows, world_rows):
+    # Recorrido anterior, sobre las listas de listas que usaban World y SimulatedRobot
+    memory_rows[robot.row][robot.col] = world_rows[robot.row][robot.col]
+    closest_theta_key = min(robot.view_pattern.keys(), key=lambda k: abs(k - robot.theta))
+    for dr, dc in robot.view_pattern.get(closest_theta_key, []):
+        target_r, target_c = robot.row + dr, robot.col + dc
+        if not (0 <= target_r < CONFIG['GRID_HEIGHT'] and 0 <= target_c < CONFIG['GRID_WIDTH']):
+            continue
+        for r, c in bresenham_line((robot.row, robot.col), (target_r, target_c)):
+            memory_rows[r][c] = world_rows[r][c]
+            if memory_rows[r][c] == MEM_OBSTACLE and (r, c) != (robot.row, robot.col):
+                break
+
+def time_ticks(fn, robot, world, poses):
+    t0 = time.perf_counter()
+    for robot.row, robot.col, robot.theta in poses:
+        fn(world)
+    return (time.perf_counter() - t0) / len(poses)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la línea de visión por tick")
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    CONFIG['GRID_WIDTH'], CONFIG['GRID_HEIGHT'] = args.size, args.size
+    random.seed(args.seed)
+    world, robot = World(seed=args.seed), SimulatedRobot()
+    headings = list(robot.view_pattern.keys())
+    moving = [(random.randrange(args.size), random.randrange(args.size), random.choice(headings)) for _ in range(args.ticks)]
+    # En la simulación real la pose solo cambia al terminar un paso de animación
+    still = [pose for pose in moving[:args.ticks // 15] for _ in range(15)]
+
+    memory_rows, world_rows = robot.memory_grid.tolist(), world.grid.tolist()
+    legacy = lambda w: legacy_update_memory_with_los(robot, w, memory_rows, world_rows)
+    print(f"{'escenario':>10} {'anterior (us)':>14} {'tablas (us)':>12} {'speedup':>8}")
+    for name, poses in (("moviendo", moving), ("animación", still)):
+        robot.last_los_pose = None
+        old = time_ticks(legacy, robot, world, poses)
+        new = time_ticks(robot.update_memory_with_los, robot, world, poses)
+        print(f"{name:>10} {old * 1e6:>14.2f} {new * 1e6:>12.2f} {old / new:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/webload.py
+# Prueba de carga del visor web: N clientes sondean /mapdata mientras la simulación corre a 60 Hz.
+import argparse
+import http.client
+import multiprocessing
+import statistics
+import threading
+import time
+
+def serve_with_simulation(port, duration, ticks_out):
+    # Proceso hijo: servidor web + simulación real, para medir si los visores la frenan
+    import web_server
+    from world import World, SimulatedRobot
+    threading.Thread(target=web_server.start_web_server, args=(port,), daemon=True).start()
+    web_server.RequestHandler.log_message = lambda *args: None
+    world, robot = World(seed=0), SimulatedRobot()
+    tick, lateness = 1 / 60, []
+    next_tick = time.perf_counter()
+    end = next_tick + duration
+    while time.perf_counter() < end:
+        robot.update(world, tick)
+        next_tick += tick
+        now = time.perf_counter()
+        lateness.append(max(0.0, now - next_tick))
+        if next_tick > now: time.sleep(next_tick - now)
+    ticks_out.put(lateness)
+
+def poller(host, port, path, stop, latencies, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            conn.getresponse().read()
+            latencies.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+        time.sleep(0.1)  # mismo intervalo de sondeo que tenía index.html
+    conn.close()
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de /mapdata con clientes concurrentes")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/mapdata")
+    parser.add_argument("--url-host", default=None, help="sondea un servidor ya arrancado en vez de lanzar uno")
+    args = parser.parse_args()
+
+    host, child, ticks = args.url_host or "localhost", None, None
+    if args.url_host is None:
+        ticks = multiprocessing.Queue()
+        child = multiprocessing.Process(target=serve_with_simulation, args=(args.port, args.duration + 2, ticks))
+        child.start()
+        time.sleep(1.0)
+
+    stop, latencies, errors = threading.Event(), [], []
+    threads = [threading.Thread(target=poller, args=(host, args.port, args.path, stop, latencies, errors))
+               for _ in range(args.clients)]
+    for t in threads: t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads: t.join()
+
+    print(f"{args.clients} clientes, {len(latencies)} peticiones en {args.duration:.0f} s ({len(latencies) / args.duration:.0f} req/s), {len(errors)} errores")
+    if latencies:
+        print(f"latencia p50 {percentile(latencies, 0.50) * 1000:.2f} ms | p99 {percentile(latencies, 0.99) * 1000:.2f} ms | "
+              f"máx {max(latencies) * 1000:.2f} ms")
+    if child is not None:
+        lateness = ticks.get()
+        child.join()
+        print(f"simulación: {len(lateness)} ticks, retraso medio {statistics.mean(lateness) * 1000:.2f} ms, "
+              f"p99 {percentile(lateness, 0.99) * 1000:.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -5,12 +5,15 @@ CONFIG = {
     "num_gnomes": 10, "num_obstacles": 15, "animation_speed": 4.0,
     "battery_capacity": 150.0, "battery_low_threshold": 30.0,
     "drain_base": 0.05, "drain_move": 2.0, "drain_turn": 1.0, "charge_rate": 10.0,
-    "num_slow_cells": 20, "cost_slow_cell": 8, "drain_slow_modifier": 3.0
+    "num_slow_cells": 20, "cost_slow_cell": 8, "drain_slow_modifier": 3.0,
+    "robot_capacity": 3, "mission_planner": "tour", "return_margin": 1.0,
+    "exploration": "frontier"
 }
 
 CELL_SIZE = 60
 UI_WIDTH = 300
 WEB_SERVER_PORT = 8000
+VIEW_RANGE = 4
 
 MEM_UNKNOWN = -1
 MEM_EMPTY = 0
@@ -34,10 +37,4 @@ COLOR_BATTERY_RED = (220, 50, 50)
 COLOR_VISION = (50, 150, 250, 50)
 COLOR_SLOW_TERRAIN = (139, 69, 19)
 
-shared_data = {
-    "memory_grid": [],
-    "robot_pos": [0, 0],
-    "grid_width": CONFIG['GRID_WIDTH'],
-    "grid_height": CONFIG['GRID_HEIGHT']
-}
 data_lock = threading.Lock()
\ No newline at end of file
@@ -1,41 +1,112 @@
 # drawing.py
 import pygame
 import math
+import numpy as np
 from constants import (CONFIG, CELL_SIZE, UI_WIDTH, COLOR_BG, COLOR_GRID, 
                        COLOR_OBSTACLE, COLOR_GNOME, COLOR_HOME, COLOR_SLOW_TERRAIN, 
                        COLOR_PATH, COLOR_VISION, COLOR_ROBOT, COLOR_TEXT, 
                        COLOR_BATTERY_GREEN, COLOR_BATTERY_ORANGE, COLOR_BATTERY_RED,
                        COLOR_TEXT_HIGHLIGHT)
 
+def draw_cell(surface, cell_type, r, c):
+    rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    if cell_type == 1: pygame.draw.rect(surface, COLOR_OBSTACLE, rect)
+    elif cell_type == 2: pygame.draw.circle(surface, COLOR_GNOME, rect.center, int(CELL_SIZE * 0.3))
+    elif cell_type == 3: pygame.draw.rect(surface, COLOR_HOME, rect, border_radius=5)
+    elif cell_type == 4: pygame.draw.rect(surface, COLOR_SLOW_TERRAIN, rect)
+
 def draw_world(screen, world):
-    for r in range(world.height):
-        for c in range(world.width):
-            rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            cell_type = world.grid[r][c]
-            if cell_type == 1: pygame.draw.rect(screen, COLOR_OBSTACLE, rect)
-            elif cell_type == 2: pygame.draw.circle(screen, COLOR_GNOME, rect.center, int(CELL_SIZE * 0.3))
-            elif cell_type == 3: pygame.draw.rect(screen, COLOR_HOME, rect, border_radius=5)
-            elif cell_type == 4: pygame.draw.rect(screen, COLOR_SLOW_TERRAIN, rect)
+    # Solo se recorren las celdas no vacías, localizadas sobre el buffer de la rejilla
+    for r, c in np.argwhere(world.grid.array != 0).tolist():
+        draw_cell(screen, world.grid[r, c], r, c)
 
 def draw_grid(screen, width, height):
     for x in range(0, width, CELL_SIZE): pygame.draw.line(screen, COLOR_GRID, (x, 0), (x, height))
     for y in range(0, height, CELL_SIZE): pygame.draw.line(screen, COLOR_GRID, (0, y), (width, y))
 
-def draw_path(screen, robot):
-    if robot.path:
-        for pos in robot.path:
-            rect = pygame.Rect(pos[1] * CELL_SIZE, pos[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, COLOR_PATH, rect)
-
-def draw_vision_cone(screen, robot):
-    vision_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-    closest_theta_key = min(robot.view_pattern.keys(), key=lambda k: abs(k - robot.theta))
-    for dr, dc in robot.view_pattern.get(closest_theta_key, []):
-        r, c = robot.row + dr, robot.col + dc
-        if 0 <= r < CONFIG['GRID_HEIGHT'] and 0 <= c < CONFIG['GRID_WIDTH']:
-            rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(vision_surface, COLOR_VISION, rect)
-    screen.blit(vision_surface, (0, 0))
+class WorldRenderer:
+    """Dibuja el mundo por capas y solo refresca en pantalla lo que cambia.
+
+    - static: mundo + líneas de rejilla, pre-renderizado una vez. Solo se
+      repintan las celdas cuyo valor difiere de la copia cacheada.
+    - overlay: una única superficie SRCALPHA para ruta y cono de visión; cada
+      frame se limpia solo donde se dibujó en el anterior.
+    El coste por frame depende de la ruta, la visión y el robot, no del tamaño del mundo.
+    """
+    def __init__(self, screen, world):
+        self.screen, self.world = screen, world
+        self.width, self.height = world.grid.width * CELL_SIZE, world.grid.height * CELL_SIZE
+        self.static = pygame.Surface((self.width, self.height)).convert()
+        self.overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA).convert_alpha()
+        self.vision_tile = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+        self.vision_tile.fill(COLOR_VISION)
+        self.cached_grid = world.grid.array.copy()
+        self.static.fill(COLOR_BG)
+        draw_world(self.static, world)
+        draw_grid(self.static, self.width, self.height)
+        self.previous_rects = []
+        self.full_redraw = True
+
+    def cell_rect(self, r, c):
+        return pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+    def refresh_static(self):
+        # Celdas que cambiaron en el mundo (p. ej. un gnomo recogido) desde el último frame
+        grid = self.world.grid
+        changed = np.argwhere(grid.array != self.cached_grid).tolist()
+        rects = []
+        for r, c in changed:
+            rect = self.cell_rect(r, c)
+            self.static.fill(COLOR_BG, rect)
+            draw_cell(self.static, grid[r, c], r, c)
+            # Las líneas de rejilla de esta celda se repintan encima, como en el pre-renderizado
+            pygame.draw.line(self.static, COLOR_GRID, rect.topleft, (rect.left, rect.bottom - 1))
+            pygame.draw.line(self.static, COLOR_GRID, rect.topleft, (rect.right - 1, rect.top))
+            self.cached_grid[r, c] = grid[r, c]
+            rects.append(rect)
+        return rects
+
+    def overlay_rects(self, robot):
+        # Celdas de la ruta (opacas) y del cono de visión (translúcidas) sobre el overlay reutilizado
+        rects = []
+        for pos in robot.path or ():
+            rect = self.cell_rect(*pos)
+            pygame.draw.rect(self.overlay, COLOR_PATH[:3], rect)
+            rects.append(rect)
+        closest_theta_key = min(robot.view_pattern.keys(), key=lambda k: abs(k - robot.theta))
+        for dr, dc in robot.view_pattern.get(closest_theta_key, []):
+            r, c = robot.row + dr, robot.col + dc
+            if self.world.grid.in_bounds(r, c):
+                rect = self.cell_rect(r, c)
+                self.overlay.blit(self.vision_tile, rect)
+                rects.append(rect)
+        return rects
+
+    def draw(self, robot):
+        """Compone el frame y devuelve los rectángulos de pantalla a actualizar."""
+        static_rects = self.refresh_static()
+        for rect in self.previous_rects:
+            self.overlay.fill((0, 0, 0, 0), rect)
+        if self.full_redraw:
+            self.screen.blit(self.static, (0, 0))
+        else:
+            # Se restaura el fondo donde hubo capas dinámicas o cambió el mundo
+            for rect in self.previous_rects + static_rects:
+                self.screen.blit(self.static, rect, rect)
+
+        rects = self.overlay_rects(robot)
+        for rect in rects:
+            self.screen.blit(self.overlay, rect, rect)
+        robot_rect = draw_robot(self.screen, robot)
+        current = rects + [robot_rect]
+
+        if self.full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        else:
+            dirty = self.previous_rects + static_rects + current
+        self.previous_rects = current
+        return dirty
 
 def draw_robot(screen, robot):
     start_px = (robot.col * CELL_SIZE + CELL_SIZE/2, robot.row * CELL_SIZE + CELL_SIZE/2)
@@ -53,6 +124,7 @@ def draw_robot(screen, robot):
     line_end_x = pos_x + math.cos(interp_angle) * (CELL_SIZE * 0.35)
     line_end_y = pos_y - math.sin(interp_angle) * (CELL_SIZE * 0.35)
     pygame.draw.line(screen, COLOR_TEXT, (pos_x, pos_y), (line_end_x, line_end_y), 3)
+    return pygame.Rect(pos_x - CELL_SIZE / 2, pos_y - CELL_SIZE / 2, CELL_SIZE, CELL_SIZE)
 
 def draw_ui(screen, robot, font, small_font, sliders, applied_w, applied_h):
     ui_width = 300
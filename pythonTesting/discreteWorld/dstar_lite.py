@@ -0,0 +1,113 @@
+# dstar_lite.py
+import heapq
+import math
+from constants import CONFIG, MEM_OBSTACLE, MEM_UNKNOWN, MEM_SLOW
+
+class DStarLite:
+    """Planificador incremental hacia una meta fija sobre la memoria del robot.
+
+    Busca hacia atrás desde la meta y conserva g/rhs entre llamadas: cuando la
+    memoria cambia solo se reparan los vértices afectados por esas celdas.
+    """
+    def __init__(self, memory_grid, goal, slow_cost=None):
+        self.memory_grid, self.goal = memory_grid, goal
+        self.slow_cost = CONFIG["cost_slow_cell"] if slow_cost is None else slow_cost
+        self.height, self.width = memory_grid.shape
+        self.g, self.rhs = {}, {goal: 0}
+        self.open_heap, self.open_keys = [], {}
+        self.km, self.last_start = 0, None
+        self.pending = set()
+
+    # --- COSTES Y VECINOS ---
+    def cost(self, pos):
+        cell = self.memory_grid.cells[pos]
+        if cell == MEM_OBSTACLE or cell == MEM_UNKNOWN: return math.inf
+        return self.slow_cost if cell == MEM_SLOW else 1
+
+    def neighbors(self, pos):
+        r, c = pos
+        for nr, nc in ((r, c + 1), (r, c - 1), (r + 1, c), (r - 1, c)):
+            if 0 <= nr < self.height and 0 <= nc < self.width:
+                yield (nr, nc)
+
+    def heuristic(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    # --- COLA DE PRIORIDAD (borrado perezoso) ---
+    def calculate_key(self, pos):
+        best = min(self.g.get(pos, math.inf), self.rhs.get(pos, math.inf))
+        return (best + self.heuristic(self.last_start, pos) + self.km, best)
+
+    def push(self, pos):
+        key = self.calculate_key(pos)
+        self.open_keys[pos] = key
+        heapq.heappush(self.open_heap, (key[0], key[1], pos))
+
+    def top(self):
+        while self.open_heap:
+            k1, k2, pos = self.open_heap[0]
+            if self.open_keys.get(pos) == (k1, k2):
+                return (k1, k2), pos
+            heapq.heappop(self.open_heap)
+        return (math.inf, math.inf), None
+
+    # --- NÚCLEO DE D* LITE ---
+    def update_vertex(self, pos):
+        if pos != self.goal:
+            self.rhs[pos] = min((self.cost(n) + self.g.get(n, math.inf) for n in self.neighbors(pos)), default=math.inf)
+        if self.g.get(pos, math.inf) != self.rhs.get(pos, math.inf): self.push(pos)
+        else: self.open_keys.pop(pos, None)
+
+    def compute_shortest_path(self, start):
+        while True:
+            key, pos = self.top()
+            start_rhs, start_g = self.rhs.get(start, math.inf), self.g.get(start, math.inf)
+            if pos is None or (key >= self.calculate_key(start) and start_rhs == start_g):
+                return
+            new_key = self.calculate_key(pos)
+            if key < new_key:
+                self.push(pos)
+                continue
+            heapq.heappop(self.open_heap)
+            del self.open_keys[pos]
+            if self.g.get(pos, math.inf) > self.rhs.get(pos, math.inf):
+                self.g[pos] = self.rhs[pos]
+                for n in self.neighbors(pos): self.update_vertex(n)
+            else:
+                self.g[pos] = math.inf
+                self.update_vertex(pos)
+                for n in self.neighbors(pos): self.update_vertex(n)
+
+    # --- API PARA EL ROBOT ---
+    def notify_changes(self, changed_cells):
+        self.pending.update(changed_cells)
+
+    def plan(self, start):
+        if self.last_start is None:
+            self.last_start = start
+            self.push(self.goal)
+        else:
+            self.km += self.heuristic(self.last_start, start)
+            self.last_start = start
+        # Entrar en una celda cambiada cuesta distinto: solo sus vecinos cambian de rhs
+        for cell in self.pending:
+            for n in self.neighbors(cell): self.update_vertex(n)
+        self.pending.clear()
+        self.compute_shortest_path(start)
+        return self.extract_path(start)
+
+    def extract_path(self, start):
+        if self.g.get(start, math.inf) == math.inf and start != self.goal:
+            return None
+        path, pos = [start], start
+        for _ in range(self.height * self.width):
+            if pos == self.goal:
+                return path
+            pos = min(self.neighbors(pos), key=lambda n: self.cost(n) + self.g.get(n, math.inf))
+            if self.cost(pos) + self.g.get(pos, math.inf) == math.inf:
+                return None
+            path.append(pos)
+        return None
+
+    def path_blocked(self, path):
+        return any(self.cost(pos) == math.inf for pos in path)
@@ -0,0 +1,291 @@
+# fleet.py
+# Flota de robots en un mismo World: memoria compartida, reparto de gnomos y fronteras
+# por subasta y tabla de reservas para no chocar en los pasillos.
+#   python fleet.py --robots 4 --width 30 --height 30 --gnomes 30
+import argparse
+import math
+import time
+from constants import CONFIG, VIEW_RANGE, MEM_UNKNOWN, MEM_OBSTACLE, MEM_GNOME
+from grid import Grid
+from utils import find_path_astar
+from world import World, SimulatedRobot
+from mission_planner import MissionPlanner
+from home_field import HomeEnergyField
+from frontier import FrontierSet
+from publisher import map_publisher
+from tracing import tracer
+
+BLOCK_PATIENCE = 3  # ciclos de animación esperando una celda reservada antes de buscar otro camino
+
+class FleetRobot(SimulatedRobot):
+    """Robot de la flota: usa la memoria y los mapas de la Fleet y recibe de ella sus tareas."""
+    def __init__(self, fleet, robot_id):
+        super().__init__(fleet.config, publish=False, memory_grid=fleet.memory_grid, frontier=fleet.frontier)
+        self.fleet, self.robot_id = fleet, robot_id
+        self.mission_planner, self.home_field = fleet.mission_planner, fleet.home_field
+        self.blocked_cycles = 0
+
+    def plan_path(self, goal, start=None):
+        # Sin D* Lite por robot: con la memoria compartida habría que avisar a los planificadores de todos
+        with tracer.span("plan_path"):
+            return find_path_astar(self.memory_grid, start or (self.row, self.col), goal, self.config["cost_slow_cell"])
+
+    # --- RESERVAS ---
+    def start_next_path_step(self):
+        if self.path and not self.fleet.reserve(self, self.path[0]):
+            # Otro robot ocupa o va a ocupar la celda: se espera un ciclo y se reintenta
+            self.blocked_cycles += 1
+            if self.blocked_cycles > BLOCK_PATIENCE:
+                # Dos robots que se esperan el uno al otro: solo se aparta el de robot_id mayor; si ambos
+                # lo hicieran, volverían a encontrarse al deshacer el rodeo
+                blocker = self.fleet.reservations.get(self.path[0])
+                if blocker.action != 'BLOQUEADO' or blocker.robot_id < self.robot_id: self.detour(blocker)
+                else: self.blocked_cycles = 0
+            self.action = 'BLOQUEADO'
+            return
+        self.blocked_cycles = 0
+        super().start_next_path_step()
+
+    def detour(self, blocker):
+        """Camino a la misma meta esquivando a los demás robots; si no hay, se aparta a una celda libre.
+
+        Al apartarse se prefiere una celda fuera del camino de blocker, para no volver a cortarle el paso.
+        """
+        self.blocked_cycles = 0
+        goal, pos = self.path[-1], (self.row, self.col)
+        others = self.fleet.occupied_by_others(self)
+        memory = self.memory_grid.copy()
+        for cell in others: memory[cell] = MEM_OBSTACLE
+        path = find_path_astar(memory, pos, goal, self.config["cost_slow_cell"]) if goal not in others else None
+        if path is None:
+            r, c = pos
+            free = [aside for aside in ((r, c + 1), (r, c - 1), (r + 1, c), (r - 1, c))
+                    if memory.in_bounds(*aside) and memory[aside] not in (MEM_OBSTACLE, MEM_UNKNOWN)]
+            in_the_way = set(blocker.path or ())
+            free.sort(key=lambda aside: aside in in_the_way)
+            if free: path = [pos, free[0]]
+        if path: self.path = path
+
+    # --- LÓGICA ---
+    def choose_frontier(self, start, avoid=(), field=None):
+        # Se estrecha el radio de avoid hasta dar con una frontera: al salir de la base todas están
+        # cerca unas de otras, y así cada robot va a una distinta en vez de todos a la mejor
+        slow = self.config["cost_slow_cell"]
+        # Campo cacheado en el MissionPlanner compartido: robots en la misma celda (la base al salir) lo
+        # calculan una sola vez, y se invalida con el resto cuando cambia el mapa
+        if field is None: field = self.mission_planner.field(start)
+        for avoid_range in range(VIEW_RANGE, -1, -1):
+            goal = self.frontier.choose_goal(start, slow, VIEW_RANGE, avoid, field, avoid_range)
+            if goal is not None or not avoid: return goal
+        return self.frontier.choose_goal(start, slow, VIEW_RANGE, (), field)
+
+    def explore(self, avoid=(), field=None):
+        super().explore(avoid, field)
+        # Sin nada que hacer se aparca en la base, que no bloquea a nadie
+        home = self.fleet.world.home_base
+        if self.state == 'TERMINADO' and (self.row, self.col) != home:
+            self.state, self.current_target_pos = 'YENDO_A_BASE', home
+            self.path = self.home_field.path_home(self.row, self.col) or self.plan_path(home)
+
+    def update_logic(self, world, dt):
+        if self.return_if_low_battery(world): return
+        if self.state == 'BUSCANDO':
+            # Pide tarea al llegar a su frontera o cuando ya se ha descubierto por el camino
+            target = self.current_target_pos
+            if self.action == 'ESPERANDO' or (target is not None and target not in self.frontier):
+                self.fleet.request(self, needs_frontier=True)
+            return
+        if self.action != 'ESPERANDO': return
+
+        if self.state == 'YENDO_AL_GNOMO':
+            gnome_pos = self.current_target_pos
+            if (self.row, self.col) == gnome_pos: self.pick_up(world, gnome_pos)
+            self.fleet.release_gnome(gnome_pos, picked=(self.row, self.col) == gnome_pos)
+            self.state, self.current_target_pos = 'YENDO_A_BASE', world.home_base
+            self.path = self.home_field.path_home(self.row, self.col) or self.plan_path(world.home_base)
+            # Si aún cabe alguno, la subasta puede desviarlo a por otro gnomo de camino
+            if len(self.inventory) < self.mission_planner.capacity: self.fleet.request(self)
+        elif self.state == 'YENDO_A_BASE':
+            self.delivered += len(self.inventory)
+            self.inventory.clear()
+            self.state, self.current_target_pos = 'BUSCANDO', None
+            self.fleet.request(self, needs_frontier=True)
+        else: self.update_charging(world, dt)
+
+        if self.action == 'ESPERANDO' and self.path: self.start_next_path_step()
+
+class Fleet:
+    """N robots en un World con una única memoria compartida.
+
+    La percepción de cada robot escribe en la misma rejilla y los mapas derivados
+    (fronteras, campo de energía a casa, campos de distancia a los gnomos) se
+    actualizan una sola vez por tick con la unión de lo revelado, así que su
+    coste no crece con el número de robots.
+    """
+    def __init__(self, world, num_robots, config=None, publish=False):
+        self.world, self.config, self.publish = world, CONFIG if config is None else config, publish
+        self.memory_grid = Grid(world.height, world.width, MEM_UNKNOWN)
+        self.mission_planner = MissionPlanner(self.memory_grid, world.home_base, self.config)
+        self.home_field = HomeEnergyField(self.memory_grid, world.home_base, self.config)
+        self.frontier = FrontierSet(self.memory_grid)
+        self.claimed = {}        # gnomo -> robot que va a por él
+        self.reservations = {}   # celda -> robot que la ocupa o va a entrar en ella
+        self.held = {}           # robot -> celdas que tiene reservadas
+        self.requests = {}       # robot -> necesita frontera si no gana ningún gnomo
+        self.changed_cells = set()
+        self.robots = [FleetRobot(self, i) for i in range(num_robots)]
+        for robot in self.robots: robot.row, robot.col = world.home_base
+
+    @property
+    def delivered(self):
+        return sum(robot.delivered for robot in self.robots)
+
+    @property
+    def finished(self):
+        return all(robot.state == 'TERMINADO' for robot in self.robots)
+
+    # --- RESERVAS ---
+    def reserve(self, robot, cell):
+        # La base es el muelle de carga: caben todos
+        if cell == self.world.home_base: return True
+        owner = self.reservations.get(cell)
+        if owner is not None and owner is not robot: return False
+        self.reservations[cell] = robot
+        self.held.setdefault(robot, set()).add(cell)
+        return True
+
+    def hold(self, robot):
+        """Deja reservadas solo la celda del robot y, si se está moviendo, la siguiente."""
+        held = {(robot.row, robot.col)}
+        if robot.action in ('GIRANDO', 'MOVIENDOSE') and robot.path: held.add(robot.path[0])
+        held.discard(self.world.home_base)
+        for cell in self.held.get(robot, set()) - held:
+            if self.reservations.get(cell) is robot: del self.reservations[cell]
+        for cell in held: self.reservations[cell] = robot
+        self.held[robot] = held
+
+    def occupied_by_others(self, robot):
+        return {cell for cell, owner in self.reservations.items() if owner is not robot}
+
+    # --- REPARTO DE TAREAS ---
+    def request(self, robot, needs_frontier=False):
+        self.requests[robot] = self.requests.get(robot, False) or needs_frontier
+
+    def release_gnome(self, gnome_pos, picked):
+        self.claimed.pop(gnome_pos, None)
+        if picked: self.mission_planner.remove_gnome(gnome_pos)
+
+    @tracer.traced("allocate")
+    def allocate(self):
+        """Subasta de los gnomos libres entre los robots que piden tarea; el resto explora.
+
+        Cada robot puja lo que le cuesta añadir el gnomo a su viaje (ir a por él y
+        llevarlo a la base, menos lo que ya iba a andar hasta la base si lleva
+        carga). Gana la puja más baja y se repite sin ese robot ni ese gnomo.
+        Las pujas salen de los campos por gnomo que cachea el MissionPlanner: su
+        coste depende de los gnomos libres, no del número de robots.
+        """
+        if not self.requests: return
+        planner, home = self.mission_planner, self.world.home_base
+        margin = self.config["return_margin"]
+        free_gnomes = [g for g in planner.known_gnomes if g not in self.claimed and planner.cost(g, home) < math.inf]
+        bids = []
+        for robot in self.requests:
+            if len(robot.inventory) >= planner.capacity: continue
+            pos = (robot.row, robot.col)
+            already = planner.cost(pos, home) if robot.inventory else 0
+            for g in free_gnomes:
+                trip = planner.cost(pos, g) + planner.cost(g, home)
+                if trip == math.inf or trip * planner.energy_per_cost > robot.battery - margin: continue
+                bids.append((trip - already, robot.robot_id, g, robot))
+
+        assigned = set()
+        for _, _, g, robot in sorted(bids, key=lambda b: b[:3]):
+            if robot in assigned or g in self.claimed: continue
+            self.claimed[g] = robot
+            assigned.add(robot)
+            robot.go_to_gnome(g)
+
+        # Los que no se llevan gnomo se reparten las fronteras: nadie elige una que ya vaya a ver otro
+        for robot, needs_frontier in self.requests.items():
+            if robot in assigned or not needs_frontier: continue
+            avoid = [other.current_target_pos for other in self.robots
+                     if other is not robot and other.state == 'BUSCANDO' and other.current_target_pos]
+            robot.explore(avoid)
+            if robot.action == 'ESPERANDO' and robot.path: robot.start_next_path_step()
+        self.requests = {}
+
+    # --- TICK ---
+    def update(self, dt):
+        world = self.world
+        changed = set()
+        for robot in self.robots:
+            robot.update_memory_with_los(world)
+            changed |= robot.changed_cells
+        self.changed_cells = changed
+        self.mission_planner.notify_changes(changed)
+        self.home_field.update(changed)
+        self.frontier.update(changed)
+        cells = self.memory_grid.cells
+        new_gnomes = [cell for cell in changed if cells[cell] == MEM_GNOME]
+        for gnome_pos in new_gnomes: self.mission_planner.add_gnome(gnome_pos)
+        if new_gnomes:
+            # Un gnomo nuevo se subasta también entre los que exploran o ya habían terminado
+            for robot in self.robots:
+                if robot.state in ('BUSCANDO', 'TERMINADO'): self.request(robot)
+
+        for robot in self.robots: robot.update_logic(world, dt)
+        self.allocate()
+        for robot in self.robots:
+            robot.execute_movement(world, dt)
+            self.hold(robot)
+        if self.publish:
+            leader = self.robots[0]
+            map_publisher.publish(self.memory_grid, (leader.row, leader.col), changed)
+
+def run_fleet(config=None, num_robots=4, dt=1/60, max_time=3600.0, seed=None):
+    # Como headless.run_mission, pero con una flota
+    mission_config = {**CONFIG, **(config or {})}
+    world = World(mission_config, seed)
+    fleet = Fleet(world, num_robots, mission_config)
+    gnomes_total = len(world.gnomes)
+    steps, sim_time = 0, 0.0
+    start = time.perf_counter()
+    while sim_time < max_time:
+        fleet.update(dt)
+        steps += 1
+        sim_time = steps * dt
+        if fleet.finished or not world.gnomes and fleet.delivered == gnomes_total: break
+        if all(robot.battery <= 0 for robot in fleet.robots): break
+    wall_time = time.perf_counter() - start
+
+    if fleet.delivered == gnomes_total or fleet.finished: outcome = 'TERMINADO'
+    elif all(robot.battery <= 0 for robot in fleet.robots): outcome = 'SIN_BATERIA'
+    else: outcome = 'TIEMPO_AGOTADO'
+    return {
+        "seed": world.seed, "robots": num_robots, "outcome": outcome, "mission_time": round(sim_time, 3),
+        "steps": steps, "gnomes_delivered": fleet.delivered, "gnomes_total": gnomes_total,
+        "delivery_rate": fleet.delivered / sim_time * 60 if sim_time else 0.0,
+        "wall_time": wall_time, "ms_per_tick": wall_time / steps * 1000 if steps else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Flota de robots sin interfaz gráfica")
+    parser.add_argument("--robots", type=int, default=4)
+    parser.add_argument("--dt", type=float, default=1/60, help="paso simulado en segundos")
+    parser.add_argument("--max-time", type=float, default=3600.0, help="tiempo simulado máximo")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--width", type=int, default=CONFIG['GRID_WIDTH'])
+    parser.add_argument("--height", type=int, default=CONFIG['GRID_HEIGHT'])
+    parser.add_argument("--gnomes", type=int, default=CONFIG['num_gnomes'])
+    args = parser.parse_args()
+
+    config = {'GRID_WIDTH': args.width, 'GRID_HEIGHT': args.height, 'num_gnomes': args.gnomes}
+    result = run_fleet(config, args.robots, dt=args.dt, max_time=args.max_time, seed=args.seed)
+    print(f"Semilla {result['seed']} | Robots: {result['robots']} | Resultado: {result['outcome']} | "
+          f"Tiempo de misión: {result['mission_time']:.1f} s | "
+          f"Gnomos entregados: {result['gnomes_delivered']}/{result['gnomes_total']} "
+          f"({result['delivery_rate']:.2f}/min) | {result['ms_per_tick']:.2f} ms/tick")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# frontier.py
+# Exploración por fronteras: celdas conocidas y transitables con alguna vecina desconocida.
+import math
+import numpy as np
+from constants import MEM_UNKNOWN, MEM_OBSTACLE
+from mission_planner import cell_cost, distance_field
+
+class FrontierSet:
+    """Conjunto de celdas frontera de la memoria del robot, al día con changed_cells.
+
+    Solo una celda que cambia y sus cuatro vecinas pueden entrar o salir del
+    conjunto, así que cada tick cuesta lo que se ha revelado y no el mapa entero.
+    """
+    def __init__(self, memory_grid):
+        self.memory_grid = memory_grid
+        self.height, self.width = memory_grid.shape
+        self.cells = set()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, pos):
+        return pos in self.cells
+
+    def is_frontier(self, r, c):
+        cells = self.memory_grid.cells
+        value = cells[r, c]
+        if value == MEM_UNKNOWN or value == MEM_OBSTACLE: return False
+        for nr, nc in ((r, c + 1), (r, c - 1), (r + 1, c), (r - 1, c)):
+            if 0 <= nr < self.height and 0 <= nc < self.width and cells[nr, nc] == MEM_UNKNOWN: return True
+        return False
+
+    def update(self, changed_cells):
+        for r, c in changed_cells:
+            for nr, nc in ((r, c), (r, c + 1), (r, c - 1), (r + 1, c), (r - 1, c)):
+                if not (0 <= nr < self.height and 0 <= nc < self.width): continue
+                if self.is_frontier(nr, nc): self.cells.add((nr, nc))
+                else: self.cells.discard((nr, nc))
+
+    def information_gain(self, view_range):
+        """Celdas desconocidas en la ventana de visión alrededor de cada celda (tabla de sumas acumuladas)."""
+        unknown = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+        unknown[1:, 1:] = np.cumsum(np.cumsum(self.memory_grid.array == MEM_UNKNOWN, axis=0), axis=1)
+        rows, cols = np.arange(self.height), np.arange(self.width)
+        r0, r1 = np.clip(rows - view_range, 0, self.height), np.clip(rows + view_range + 1, 0, self.height)
+        c0, c1 = np.clip(cols - view_range, 0, self.width), np.clip(cols + view_range + 1, 0, self.width)
+        return (unknown[r1][:, c1] - unknown[r0][:, c1] - unknown[r1][:, c0] + unknown[r0][:, c0])
+
+    def choose_goal(self, start, slow_cost, view_range, avoid=(), field=None, avoid_range=None):
+        """Frontera alcanzable con más ganancia de información por coste de viaje, o None.
+
+        Las fronteras a menos de avoid_range (por defecto view_range) de alguna
+        celda de avoid (metas de otros robots) no se eligen: lo que se vería desde
+        ellas ya está repartido. field es el distance_field hacia start, si ya se
+        tiene calculado.
+        """
+        if not self.cells: return None
+        gain = self.information_gain(view_range)
+        # Campo hacia start: ir de start a x cuesta lo mismo que volver, cambiando qué extremo se paga
+        if field is None: field = distance_field(self.memory_grid, start, slow_cost)
+        flat, width = self.memory_grid.flat, self.width
+        start_cost = cell_cost(flat[start[0] * width + start[1]], slow_cost)
+        if avoid_range is None: avoid_range = view_range
+        best, best_score = None, 0.0
+        for r, c in self.cells:
+            i = r * width + c
+            if field[i] == math.inf or (r, c) == start: continue
+            if any(abs(r - ar) <= avoid_range and abs(c - ac) <= avoid_range for ar, ac in avoid): continue
+            cost = field[i] + cell_cost(flat[i], slow_cost) - start_cost
+            score = gain[r, c] / cost
+            if score > best_score: best, best_score = (r, c), score
+        return best
@@ -0,0 +1,60 @@
+# grid.py
+import numpy as np
+
+class Grid:
+    """Rejilla de celdas int8 en un único buffer contiguo (fila mayor).
+
+    - grid[r, c] lee/escribe una celda como int de Python.
+    - grid[r] o grid[r0:r1, c0:c1] devuelven vistas NumPy sin copia.
+    - array, cells y flat exponen el mismo buffer: el ndarray para operaciones
+      vectorizadas y memoryviews (2D y 1D) para los bucles calientes, donde
+      indexarlos es mucho más barato que pasar por NumPy.
+    """
+    __slots__ = ('height', 'width', 'array', 'cells', 'flat')
+
+    def __init__(self, height, width, fill=0):
+        self.height, self.width = height, width
+        self.array = np.full((height, width), fill, dtype=np.int8)
+        self.cells = memoryview(self.array)
+        self.flat = self.cells.cast('B').cast('b')
+
+    @classmethod
+    def from_rows(cls, rows):
+        grid = cls(len(rows), len(rows[0]) if rows else 0)
+        grid.array[:] = rows
+        return grid
+
+    @property
+    def shape(self):
+        return self.height, self.width
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, key):
+        if type(key) is tuple and type(key[0]) is int and type(key[1]) is int:
+            return self.cells[key]
+        return self.array[key]
+
+    def __setitem__(self, key, value):
+        if type(key) is tuple and type(key[0]) is int and type(key[1]) is int:
+            self.cells[key] = value
+        else:
+            self.array[key] = value
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def count(self, value):
+        return int(np.count_nonzero(self.array == value))
+
+    def copy(self):
+        grid = Grid(self.height, self.width)
+        grid.array[:] = self.array
+        return grid
+
+    def tobytes(self):
+        return self.array.tobytes()
+
+    def tolist(self):
+        return self.array.tolist()
@@ -0,0 +1,70 @@
+# headless.py
+# Ejecuta misiones sin pygame ni pantalla: dt simulado fijo y sin límite de FPS.
+import argparse
+import json
+import time
+from constants import CONFIG
+from world import World, SimulatedRobot
+from tracing import tracer
+from replay import ReplayRecorder
+
+def run_mission(config=None, dt=1/60, max_time=3600.0, seed=None, battery_sample_every=1.0, replay=None):
+    # config son cambios sobre los valores por defecto; el CONFIG global no se toca
+    mission_config = {**CONFIG, **(config or {})}
+    world, robot = World(mission_config, seed), SimulatedRobot(mission_config, publish=False)
+    # replay: ruta del log binario donde grabar cada tick (ver replay.py)
+    recorder = ReplayRecorder(replay, world, robot, dt) if replay else None
+    gnomes_total = len(world.gnomes)
+    battery_curve, next_sample = [], 0.0
+    steps, sim_time = 0, 0.0
+
+    start = time.perf_counter()
+    while sim_time < max_time:
+        if sim_time >= next_sample:
+            battery_curve.append((round(sim_time, 3), round(robot.battery, 3)))
+            next_sample += battery_sample_every
+        robot.update(world, dt)
+        if recorder: recorder.record(robot)
+        steps += 1
+        sim_time = steps * dt
+        if robot.state == 'TERMINADO' or robot.battery <= 0: break
+    wall_time = time.perf_counter() - start
+    if recorder: recorder.close()
+    battery_curve.append((round(sim_time, 3), round(robot.battery, 3)))
+
+    if robot.state == 'TERMINADO': outcome = 'TERMINADO'
+    elif robot.battery <= 0: outcome = 'SIN_BATERIA'
+    else: outcome = 'TIEMPO_AGOTADO'
+    return {
+        "seed": world.seed, "outcome": outcome, "mission_time": round(sim_time, 3), "steps": steps,
+        "gnomes_delivered": robot.delivered, "gnomes_total": gnomes_total,
+        "battery_final": round(robot.battery, 3), "battery_curve": battery_curve,
+        "wall_time": wall_time, "steps_per_second": steps / wall_time if wall_time > 0 else float('inf'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación sin interfaz gráfica")
+    parser.add_argument("--dt", type=float, default=1/60, help="paso simulado en segundos")
+    parser.add_argument("--max-time", type=float, default=3600.0, help="tiempo simulado máximo")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--width", type=int, default=CONFIG['GRID_WIDTH'])
+    parser.add_argument("--height", type=int, default=CONFIG['GRID_HEIGHT'])
+    parser.add_argument("--json", help="guarda el resultado completo en este fichero")
+    parser.add_argument("--replay", help="graba cada tick en este log binario (reproducible con replay.py)")
+    parser.add_argument("--trace", help="guarda las trazas por fase de los últimos ticks (formato trace-event de Chrome)")
+    args = parser.parse_args()
+
+    if args.trace: tracer.enable()
+    config = {'GRID_WIDTH': args.width, 'GRID_HEIGHT': args.height}
+    result = run_mission(config, dt=args.dt, max_time=args.max_time, seed=args.seed, replay=args.replay)
+    print(f"Semilla {result['seed']} | Resultado: {result['outcome']} | Tiempo de misión: {result['mission_time']:.1f} s | "
+          f"Gnomos entregados: {result['gnomes_delivered']}/{result['gnomes_total']} | "
+          f"Batería final: {result['battery_final']:.1f} | {result['steps_per_second']:.0f} pasos/s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.trace:
+        print(f"Trazas: {tracer.dump(args.trace)} tramos en {args.trace}")
+
+if __name__ == '__main__':
+    main()
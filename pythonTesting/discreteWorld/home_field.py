@@ -0,0 +1,100 @@
+# home_field.py
+import math
+from constants import CONFIG, MEM_OBSTACLE, MEM_UNKNOWN, MEM_SLOW
+from dstar_lite import DStarLite
+
+# Dirección de avance por rumbo, en el orden de theta = 0, pi/2, pi, -pi/2 (fila crece hacia abajo)
+DIRECTIONS = ((0, 1), (-1, 0), (0, -1), (1, 0))
+# Estado que nunca existe: compute_shortest_path no para hasta vaciar la cola
+NO_START = (-1, -1, 0)
+
+class HomeEnergyField(DStarLite):
+    """Energía mínima para volver a la base desde cada celda y rumbo de la memoria del robot.
+
+    Reutiliza la búsqueda incremental de DStarLite sin heurística ni inicio: es
+    un Dijkstra hacia atrás desde la base que, al revelarse celdas, solo repara
+    los estados afectados. Los estados son (fila, columna, rumbo) porque girar
+    gasta. Como en execute_movement, girar y avanzar duran un ciclo de animación
+    cada uno y gastan más si se sale de terreno lento; g se guarda en consumo por
+    ciclo y se divide por animation_speed al consultar, así que el deslizador de
+    velocidad no invalida nada.
+    """
+    def __init__(self, memory_grid, home, config=None):
+        self.config = CONFIG if config is None else config
+        super().__init__(memory_grid, (*home, 0), self.config["cost_slow_cell"])
+        self.home = home
+        c = self.config
+        self.move_rate, self.turn_rate = c["drain_base"] + c["drain_move"], c["drain_base"] + c["drain_turn"]
+        self.last_start = NO_START
+        for h in range(4):
+            self.rhs[(*home, h)] = 0
+            self.push((*home, h))
+
+    # --- GRAFO DE ESTADOS ---
+    def heuristic(self, a, b):
+        return 0
+
+    def factor(self, r, c):
+        cell = self.memory_grid.cells[r, c]
+        if cell == MEM_OBSTACLE or cell == MEM_UNKNOWN: return math.inf
+        return self.config["drain_slow_modifier"] if cell == MEM_SLOW else 1
+
+    def successors(self, state):
+        r, c, h = state
+        factor = self.factor(r, c)
+        if factor == math.inf: return
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.height and 0 <= nc < self.width and self.factor(nr, nc) != math.inf:
+                yield (nr, nc, d), factor * (self.move_rate + (self.turn_rate if d != h else 0))
+
+    def neighbors(self, state):
+        # Predecesores: los que llegan a (r, c) avanzando con rumbo d, vinieran con el rumbo que vinieran
+        r, c, d = state
+        dr, dc = DIRECTIONS[d]
+        pr, pc = r - dr, c - dc
+        if 0 <= pr < self.height and 0 <= pc < self.width:
+            for h in range(4): yield (pr, pc, h)
+
+    def update_vertex(self, state):
+        if state[:2] != self.home:
+            self.rhs[state] = min((cost + self.g.get(n, math.inf) for n, cost in self.successors(state)), default=math.inf)
+        if self.g.get(state, math.inf) != self.rhs.get(state, math.inf): self.push(state)
+        else: self.open_keys.pop(state, None)
+
+    # --- API PARA EL ROBOT ---
+    def update(self, changed_cells):
+        # Una celda revelada cambia lo que cuesta salir de ella y si se puede entrar desde sus vecinas
+        for r, c in changed_cells:
+            for nr, nc in ((r, c), (r, c + 1), (r, c - 1), (r + 1, c), (r - 1, c)):
+                if 0 <= nr < self.height and 0 <= nc < self.width:
+                    for h in range(4): self.update_vertex((nr, nc, h))
+        self.compute_shortest_path(NO_START)
+
+    def energy(self, r, c, next_cell=None):
+        """Cota de la batería necesaria para llegar a la base desde (r, c), en O(1).
+
+        Se parte del rumbo 0: al replanificar, el robot da primero un paso sobre
+        su propia celda (gira a theta = 0 y avanza), o acaba la acción en curso
+        y como mucho gira una vez más. Ese ciclo extra y el giro van incluidos.
+        Con next_cell se cuenta además con dar antes ese paso, para no decidir
+        volver cuando ya se ha entrado en una celda lenta.
+        """
+        g = self.g.get((r, c, 0), math.inf)
+        if g == math.inf: return math.inf
+        factor = self.factor(r, c)
+        energy = (g + factor * (max(self.move_rate, self.turn_rate) + self.turn_rate)) / self.config["animation_speed"]
+        if next_cell is None or next_cell == (r, c): return energy
+        step = factor * (self.move_rate + self.turn_rate) / self.config["animation_speed"]
+        return max(energy, step + self.energy(*next_cell))
+
+    def path_home(self, r, c):
+        """Camino de menor energía hasta la base, empezando por la celda actual como plan_path."""
+        state = (r, c, 0)
+        if self.g.get(state, math.inf) == math.inf: return None
+        path = [(r, c)]
+        for _ in range(4 * self.height * self.width):
+            if state[:2] == self.home: return path
+            state = min(self.successors(state), key=lambda s: s[1] + self.g.get(s[0], math.inf))[0]
+            path.append(state[:2])
+        return None
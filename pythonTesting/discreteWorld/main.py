@@ -1,10 +1,17 @@
+import argparse
 import threading
 import webbrowser
 import time
 from web_server import start_web_server
 from simulation import Game
+from tracing import tracer
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulación con visor web")
+    parser.add_argument("--trace", help="al salir guarda las trazas por fase de los últimos ticks (formato trace-event de Chrome)")
+    args = parser.parse_args()
+    if args.trace: tracer.enable()
+
     server_thread = threading.Thread(target=start_web_server, daemon=True)
     server_thread.start()
     
@@ -12,4 +19,5 @@ if __name__ == '__main__':
     webbrowser.open('http://localhost:8000')
 
     game = Game()
-    game.run()
\ No newline at end of file
+    game.run()
+    if args.trace: print(f"Trazas: {tracer.dump(args.trace)} tramos en {args.trace}")
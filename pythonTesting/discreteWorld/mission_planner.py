@@ -0,0 +1,141 @@
+# mission_planner.py
+# Orden de recogida de gnomos como un problema de rutas con capacidad y batería:
+# viajes base -> gnomos -> base que se construyen por inserción barata y se pulen con 2-opt.
+import heapq
+import math
+from collections import namedtuple
+from constants import CONFIG, MEM_OBSTACLE, MEM_UNKNOWN, MEM_SLOW
+
+# stops: gnomos en orden de visita; cost: coste de planificación de todo el viaje
+Trip = namedtuple('Trip', 'stops cost energy')
+
+def cell_cost(cell, slow_cost):
+    if cell == MEM_OBSTACLE or cell == MEM_UNKNOWN: return math.inf
+    return slow_cost if cell == MEM_SLOW else 1
+
+def distance_field(memory_grid, source, slow_cost):
+    """Coste de ir desde cada celda hasta source (lista plana, inf si no se llega).
+
+    Dijkstra hacia atrás desde source: entrar en una celda cuesta lo mismo que en
+    find_path_astar, así que field[i] coincide con el coste del A* de i a source.
+    """
+    height, width, flat = memory_grid.height, memory_grid.width, memory_grid.flat
+    field = [math.inf] * (height * width)
+    source_i = source[0] * width + source[1]
+    field[source_i] = 0
+    open_heap = [(0, source_i)]
+    while open_heap:
+        d, i = heapq.heappop(open_heap)
+        if d > field[i]: continue
+        # Quien esté al lado de i llega a source pagando la entrada en i
+        step = cell_cost(flat[i], slow_cost)
+        if step == math.inf: continue
+        new_d = d + step
+        r, c = divmod(i, width)
+        for ni, nr, nc in ((i + 1, r, c + 1), (i - 1, r, c - 1), (i + width, r + 1, c), (i - width, r - 1, c)):
+            if not (0 <= nr < height and 0 <= nc < width): continue
+            if new_d < field[ni] and cell_cost(flat[ni], slow_cost) != math.inf:
+                field[ni] = new_d
+                heapq.heappush(open_heap, (new_d, ni))
+    return field
+
+class MissionPlanner:
+    """Gnomos conocidos y campos de distancia por fuente sobre la memoria del robot.
+
+    Cada campo (uno hacia la base y uno hacia cada gnomo) se calcula una vez y se
+    reutiliza hasta que la memoria cambia de forma que altere algún coste.
+    """
+    def __init__(self, memory_grid, home, config=None):
+        self.memory_grid, self.home = memory_grid, home
+        self.config = CONFIG if config is None else config
+        self.slow_cost = self.config["cost_slow_cell"]
+        self.capacity = max(1, self.config.get("robot_capacity", 1))
+        self.known_gnomes = []
+        self.fields = {}
+        self.cell_costs = [cell_cost(v, self.slow_cost) for v in memory_grid.flat]
+        # Estimación pesimista de energía por unidad de coste: un giro y un avance por paso
+        c = self.config
+        self.energy_per_cost = (2 * c["drain_base"] + c["drain_move"] + c["drain_turn"]) / c["animation_speed"]
+
+    # --- CONOCIMIENTO ---
+    def add_gnome(self, pos):
+        if pos not in self.known_gnomes: self.known_gnomes.append(pos)
+
+    def remove_gnome(self, pos):
+        if pos in self.known_gnomes: self.known_gnomes.remove(pos)
+        self.fields.pop(pos, None)
+
+    def notify_changes(self, changed_cells):
+        # Recoger un gnomo o descubrir una celda del mismo coste no invalida nada
+        width, flat = self.memory_grid.width, self.memory_grid.flat
+        for r, c in changed_cells:
+            i = r * width + c
+            new_cost = cell_cost(flat[i], self.slow_cost)
+            if new_cost != self.cell_costs[i]:
+                self.cell_costs[i] = new_cost
+                self.fields.clear()
+
+    # --- COSTES ---
+    def field(self, source):
+        field = self.fields.get(source)
+        if field is None:
+            field = self.fields[source] = distance_field(self.memory_grid, source, self.slow_cost)
+        return field
+
+    def cost(self, a, b):
+        return self.field(b)[a[0] * self.memory_grid.width + a[1]]
+
+    def route_cost(self, route):
+        return sum(self.cost(a, b) for a, b in zip(route, route[1:]))
+
+    # --- RUTAS ---
+    def build_trip(self, start, remaining, slots, budget):
+        """Ruta start -> gnomos -> base por inserción más barata, dentro de capacidad y presupuesto."""
+        route, total = [start, self.home], self.cost(start, self.home)
+        while slots and remaining:
+            best = None
+            for gnome in remaining:
+                for k in range(1, len(route)):
+                    delta = self.cost(route[k - 1], gnome) + self.cost(gnome, route[k]) - self.cost(route[k - 1], route[k])
+                    if total + delta <= budget and (best is None or delta < best[0]):
+                        best = (delta, gnome, k)
+            if best is None: break
+            delta, gnome, k = best
+            route.insert(k, gnome)
+            remaining.remove(gnome)
+            total += delta
+            slots -= 1
+        return self.two_opt(route)
+
+    def two_opt(self, route):
+        # Extremos fijos; con celdas lentas el coste no es simétrico, así que se evalúa la ruta entera
+        best_cost, improved = self.route_cost(route), True
+        while improved:
+            improved = False
+            for i in range(1, len(route) - 2):
+                for j in range(i + 1, len(route) - 1):
+                    candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                    candidate_cost = self.route_cost(candidate)
+                    if candidate_cost < best_cost:
+                        route, best_cost, improved = candidate, candidate_cost, True
+        return route, best_cost
+
+    def plan(self, start, carried, battery):
+        """Viajes que recogen los gnomos conocidos, el primero desde start con carried gnomos a cuestas.
+
+        Cada viaje cabe en la capacidad y su energía estimada en la batería
+        utilizable (la actual para el primero, una carga completa para el resto).
+        Los gnomos a los que no se llega se quedan fuera de todos los viajes.
+        """
+        reserve = self.config["return_margin"]
+        full_budget = (self.config["battery_capacity"] - reserve) / self.energy_per_cost
+        remaining = [g for g in self.known_gnomes if self.cost(g, self.home) < math.inf]
+        trips = []
+        first_budget = max(0.0, battery - reserve) / self.energy_per_cost
+        route, cost = self.build_trip(start, remaining, self.capacity - carried, first_budget)
+        trips.append(Trip(route[1:-1], cost, cost * self.energy_per_cost))
+        while remaining:
+            route, cost = self.build_trip(self.home, remaining, self.capacity, full_budget)
+            if len(route) == 2: break
+            trips.append(Trip(route[1:-1], cost, cost * self.energy_per_cost))
+        return trips
@@ -0,0 +1,150 @@
+# publisher.py
+import json
+import struct
+import threading
+from collections import namedtuple
+import numpy as np
+
+# Estados inmutables: el escritor construye uno nuevo y lo publica reasignando
+# un único atributo, así que los lectores nunca toman un lock ni ven medio tick.
+ChangeLog = namedtuple('ChangeLog', 'version base_version robot_pos entries')
+Snapshot = namedtuple('Snapshot', 'version width height robot_pos cells')
+
+EMPTY_MAP = {"version": 0, "memory_grid": [], "robot_pos": [0, 0], "grid_width": 0, "grid_height": 0}
+
+# Cuerpo binario de /mapdata.bin: cabecera + celdas int8 en fila mayor, tal cual (RAW) o como
+# pares (longitud uint8, valor int8) de runs de celdas iguales (RLE)
+MAP_HEADER = struct.Struct('<4sBBHHhhI')  # magic, formato, codificación, ancho, alto, fila y columna del robot, versión
+MAP_MAGIC, MAP_FORMAT = b'DWMP', 1
+ENCODING_RAW, ENCODING_RLE = 0, 1
+MAX_RUN = 255
+
+def run_length_encode(cells):
+    """Pares (longitud, valor) de cells (bytes int8); los runs de más de MAX_RUN se parten."""
+    flat = np.frombuffer(cells, dtype=np.int8)
+    if not flat.size: return b''
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, flat.size))
+    # Cada run se reparte en trozos de MAX_RUN; el último lleva el resto
+    pieces = (lengths + MAX_RUN - 1) // MAX_RUN
+    pairs = np.empty((int(pieces.sum()), 2), dtype=np.uint8)
+    pairs[:, 0] = MAX_RUN
+    pairs[np.cumsum(pieces) - 1, 0] = lengths - MAX_RUN * (pieces - 1)
+    pairs[:, 1] = np.repeat(flat[starts], pieces).view(np.uint8)
+    return pairs.tobytes()
+
+def snapshot_dict(snapshot):
+    """Diccionario JSON de /mapdata para una Snapshot (o el mapa vacío si es None)."""
+    if snapshot is None: return dict(EMPTY_MAP)
+    grid = np.frombuffer(snapshot.cells, dtype=np.int8).reshape(snapshot.height, snapshot.width)
+    return {"version": snapshot.version, "grid_width": snapshot.width, "grid_height": snapshot.height,
+            "robot_pos": list(snapshot.robot_pos), "memory_grid": grid.tolist()}
+
+class MapPublisher:
+    """Publica la memoria del robot como versiones numeradas con sus cambios.
+
+    El simulador es el único escritor. Mantiene su propia copia de la rejilla
+    (la del robot sigue mutando) y, como mucho una vez por tick y solo si algún
+    lector la ha pedido, congela esa copia en bytes como instantánea nueva.
+    """
+    def __init__(self, history=512):
+        self.history = history
+        self.source, self.grid = None, None
+        self.log = ChangeLog(0, 0, (0, 0), ())
+        self.snapshot = None
+        self.snapshot_wanted = False
+        self.changed_event = threading.Event()
+        self.snapshot_event = threading.Event()
+        self.json_cache = (None, None)
+        self.binary_cache = {}
+
+    # --- ESCRITOR (hilo de la simulación) ---
+    def publish(self, memory_grid, robot_pos, changed_cells):
+        robot_pos, log = tuple(robot_pos), self.log
+        if memory_grid is not self.source:
+            # Rejilla nueva (reinicio de la simulación): los deltas anteriores ya no valen
+            self.source, self.grid = memory_grid, memory_grid.copy()
+            version = log.version + 1
+            self.log = ChangeLog(version, version, robot_pos, ())
+            self.snapshot_wanted = True
+        elif changed_cells or robot_pos != log.robot_pos:
+            cells = []
+            for r, c in changed_cells:
+                value = memory_grid[r, c]
+                self.grid[r, c] = value
+                cells.append((r, c, value))
+            version = log.version + 1
+            entries = log.entries[-(self.history - 1):] + ((version, tuple(cells), robot_pos),)
+            self.log = ChangeLog(version, log.base_version, robot_pos, entries)
+
+        if self.snapshot_wanted:
+            # tobytes copia el buffer: la instantánea no cambia aunque la rejilla siga mutando
+            current = self.log
+            self.snapshot = Snapshot(current.version, self.grid.width, self.grid.height, current.robot_pos, self.grid.tobytes())
+            self.snapshot_wanted = False
+            event, self.snapshot_event = self.snapshot_event, threading.Event()
+            event.set()
+        if self.log is not log:
+            event, self.changed_event = self.changed_event, threading.Event()
+            event.set()
+
+    # --- LECTORES (hilos del servidor web) ---
+    def latest_snapshot(self, wait=0.0):
+        """Instantánea de la última versión; si está atrasada se pide otra al escritor.
+
+        Con wait se espera hasta wait segundos a que el escritor la congele en su
+        próximo tick; sin wait, o si no llega a tiempo (simulación en pausa), se
+        sirve la última disponible, que puede ser de varias versiones atrás.
+        """
+        # El evento se lee antes que la instantánea: si el escritor congela otra entre medias, ya está puesto
+        event, snapshot = self.snapshot_event, self.snapshot
+        if snapshot is None or snapshot.version != self.log.version:
+            self.snapshot_wanted = True
+            if wait and event.wait(wait): snapshot = self.snapshot
+        return snapshot
+
+    def snapshot_data(self, wait=0.0):
+        return snapshot_dict(self.latest_snapshot(wait))
+
+    def snapshot_json(self, wait=0.0):
+        snapshot = self.latest_snapshot(wait)
+        version, body = self.json_cache
+        if snapshot is None or version != snapshot.version:
+            # El cuerpo sale de la misma instantánea con cuya versión se cachea
+            body = json.dumps(snapshot_dict(snapshot)).encode('utf-8')
+            self.json_cache = (snapshot.version if snapshot else None, body)
+        return body
+
+    def snapshot_binary(self, rle=False, wait=0.0):
+        """Cuerpo de /mapdata.bin: MAP_HEADER y las celdas, con RLE si rle."""
+        snapshot = self.latest_snapshot(wait)
+        encoding = ENCODING_RLE if rle else ENCODING_RAW
+        if snapshot is None: return MAP_HEADER.pack(MAP_MAGIC, MAP_FORMAT, encoding, 0, 0, 0, 0, 0)
+        version, body = self.binary_cache.get(encoding, (None, None))
+        if version != snapshot.version:
+            header = MAP_HEADER.pack(MAP_MAGIC, MAP_FORMAT, encoding, snapshot.width, snapshot.height,
+                                     *snapshot.robot_pos, snapshot.version)
+            body = header + (run_length_encode(snapshot.cells) if rle else snapshot.cells)
+            self.binary_cache[encoding] = (snapshot.version, body)
+        return body
+
+    def changes_since(self, version):
+        """Cambios acumulados desde version, o None si hace falta una instantánea."""
+        log = self.log
+        if version < log.base_version or version > log.version: return None
+        if log.entries and log.entries[0][0] > version + 1: return None
+        merged = {}
+        for change_version, cells, _ in log.entries:
+            if change_version <= version: continue
+            for r, c, value in cells:
+                merged[(r, c)] = value
+        return {"version": log.version, "robot_pos": list(log.robot_pos),
+                "cells": [[r, c, value] for (r, c), value in merged.items()]}
+
+    def wait_for_change(self, version, timeout=None):
+        # El evento se lee antes que la versión: si el escritor publica entre medias, ese evento ya está puesto
+        event = self.changed_event
+        if self.log.version != version: return True
+        return event.wait(timeout)
+
+map_publisher = MapPublisher()
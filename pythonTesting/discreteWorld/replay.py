@@ -0,0 +1,304 @@
+# replay.py
+# Registro binario de misiones tick a tick y su reproducción en pygame o en el visor web.
+#   python headless.py --seed 3 --replay mision.dwr
+#   python replay.py mision.dwr --speed 4 --web
+#
+# Formato (little-endian):
+#   cabecera   HEADER + rejilla inicial del mundo (int8, fila mayor)
+#   registros  'K' tick + memoria completa antes de ese tick (cada keyframe_every ticks)
+#              'T' TICK + n_changes * CELL: pose, acción/estado, batería y celdas de memoria cambiadas
+#   índice     (tick, offset) de cada keyframe + TRAILER; se escribe al cerrar
+# Sin índice (grabación interrumpida) el lector lo reconstruye recorriendo el fichero una vez.
+import argparse
+import mmap
+import struct
+import time
+import numpy as np
+from constants import CONFIG, VIEW_RANGE, MEM_UNKNOWN
+from grid import Grid
+from visibility import HEADINGS, view_offsets
+
+MAGIC, INDEX_MAGIC, FORMAT_VERSION = b'DWRPLAY1', b'DWRINDEX', 1
+HEADER = struct.Struct('<8sHHHIQdf')     # magic, versión, ancho, alto, keyframe_every, semilla, dt, batería máx.
+TICK = struct.Struct('<cIHHfffBBfHBhhhhH')
+CELL = struct.Struct('<HHb')
+KEYFRAME = struct.Struct('<cI')
+INDEX_ENTRY = np.dtype([('tick', '<u4'), ('offset', '<u8')])
+TRAILER = struct.Struct('<QII8s')        # offset del índice, nº de keyframes, nº de ticks, magic
+
+ACTIONS = ('ESPERANDO', 'GIRANDO', 'MOVIENDOSE', 'BLOQUEADO')
+STATES = ('BUSCANDO', 'YENDO_AL_GNOMO', 'YENDO_A_BASE', 'VOLVIENDO_A_CASA', 'CARGANDO', 'TERMINADO')
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+NO_CELL = (-1, -1)
+
+# --- GRABACIÓN ---
+class ReplayRecorder:
+    """Añade un registro por tick al fichero; record() se llama después de robot.update()."""
+    def __init__(self, path, world, robot, dt, keyframe_every=600):
+        self.file = open(path, 'wb')
+        # Los registros se acumulan en un bytearray y se vuelcan por bloques: un write por tick cuesta más que empaquetarlo
+        self.buffer, self.written = bytearray(), 0
+        self.keyframe_every, self.tick = keyframe_every, 0
+        self.keyframes = []
+        self.buffer += HEADER.pack(MAGIC, FORMAT_VERSION, world.width, world.height, keyframe_every,
+                                   world.seed or 0, dt, robot.config["battery_capacity"])
+        self.buffer += world.grid.tobytes()
+        self.write_keyframe(robot)
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.written += len(self.buffer)
+        self.buffer.clear()
+
+    def write_keyframe(self, robot):
+        self.keyframes.append((self.tick, self.written + len(self.buffer)))
+        self.buffer += KEYFRAME.pack(b'K', self.tick)
+        self.buffer += robot.memory_grid.tobytes()
+
+    def record(self, robot):
+        changed, buffer = robot.changed_cells, self.buffer
+        next_r, next_c = robot.path[0] if robot.path else NO_CELL
+        target_r, target_c = robot.current_target_pos or NO_CELL
+        buffer += TICK.pack(b'T', self.tick, robot.row, robot.col, robot.theta, robot.target_theta,
+                            robot.animation_progress, ACTION_CODES[robot.action], STATE_CODES[robot.state],
+                            robot.battery, robot.delivered, len(robot.inventory), next_r, next_c, target_r, target_c, len(changed))
+        if changed:
+            memory, pack = robot.memory_grid.cells, CELL.pack
+            for r, c in changed: buffer += pack(r, c, memory[r, c])
+        self.tick += 1
+        # El keyframe del tick t guarda la memoria antes de aplicar t: aquí, justo después de t - 1
+        if self.tick % self.keyframe_every == 0:
+            self.write_keyframe(robot)
+            self.flush()
+
+    def close(self):
+        if self.file.closed: return
+        index_offset = self.written + len(self.buffer)
+        self.buffer += np.array(self.keyframes, dtype=INDEX_ENTRY).tobytes()
+        self.buffer += TRAILER.pack(index_offset, len(self.keyframes), self.tick, INDEX_MAGIC)
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+# --- LECTURA ---
+class ReplayRobot:
+    """Lo que drawing necesita de un SimulatedRobot, leído de un registro."""
+    def __init__(self):
+        self.row, self.col, self.theta, self.target_theta = 0, 0, 0.0, 0.0
+        self.animation_progress, self.action, self.state = 0.0, 'ESPERANDO', 'BUSCANDO'
+        self.battery, self.delivered, self.carried = 0.0, 0, 0
+        self.path, self.current_target_pos, self.potential_decisions = [], None, []
+        self.view_pattern = {heading: view_offsets(VIEW_RANGE, heading) for heading in HEADINGS}
+
+class ReplayWorld:
+    def __init__(self, grid):
+        self.grid = grid
+        self.height, self.width = grid.shape
+
+class ReplayState:
+    """Memoria, mundo y robot tras aplicar los ticks hasta tick (incluido)."""
+    def __init__(self, world_cells, memory_cells, height, width):
+        self.memory = Grid(height, width)
+        self.memory.array[:] = memory_cells
+        # El robot solo escribe en memoria lo que ve del mundo: donde la memoria es conocida, el mundo
+        # coincide con ella (gnomos recogidos incluidos); donde no, sigue como al empezar
+        world = Grid(height, width)
+        world.array[:] = np.where(self.memory.array == MEM_UNKNOWN, world_cells, self.memory.array)
+        self.world = ReplayWorld(world)
+        self.robot = ReplayRobot()
+        self.tick, self.changed_cells = -1, set()
+
+    def apply(self, fields, changes):
+        robot = self.robot
+        (_, self.tick, robot.row, robot.col, robot.theta, robot.target_theta, robot.animation_progress, action, state,
+         robot.battery, robot.delivered, robot.carried, next_r, next_c, target_r, target_c, _) = fields
+        robot.action, robot.state = ACTIONS[action], STATES[state]
+        robot.path = [(next_r, next_c)] if next_r >= 0 else []
+        robot.current_target_pos = (target_r, target_c) if target_r >= 0 else None
+        memory, world = self.memory.cells, self.world.grid.cells
+        self.changed_cells = set()
+        for r, c, value in changes:
+            memory[r, c] = world[r, c] = value
+            self.changed_cells.add((r, c))
+
+class ReplayLog:
+    """Log de repetición mapeado en memoria; state_at(tick) llega a cualquier tick en O(log n)."""
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.width, self.height, self.keyframe_every,
+         self.seed, self.dt, self.battery_capacity) = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION: raise ValueError(f"{path}: no es un log de repetición")
+        self.cells = self.width * self.height
+        self.records_start = HEADER.size + self.cells
+        # Copias (trozos del mmap): una vista de NumPy impediría cerrar el mmap
+        self.world_cells = self.grid_at(HEADER.size)
+        if not self.read_index(): self.rebuild_index()
+
+    def read_index(self):
+        if len(self.data) < self.records_start + TRAILER.size: return False
+        index_offset, count, ticks, magic = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+        if magic != INDEX_MAGIC: return False
+        index = np.frombuffer(self.data, dtype=INDEX_ENTRY, count=count, offset=index_offset)
+        self.key_ticks, self.key_offsets = index['tick'].copy(), index['offset'].copy()
+        self.records_end, self.ticks = index_offset, ticks
+        return True
+
+    def rebuild_index(self):
+        keyframes, ticks, offset, end = [], 0, self.records_start, len(self.data)
+        while True:
+            record = self.read_record(offset, end)
+            if record is None: break
+            kind, fields, _, offset = record
+            if kind == b'K': keyframes.append((fields, offset - KEYFRAME.size - self.cells))
+            else: ticks += 1
+        self.key_ticks = np.array([tick for tick, _ in keyframes], dtype=np.uint32)
+        self.key_offsets = np.array([offset for _, offset in keyframes], dtype=np.uint64)
+        self.records_end, self.ticks = offset, ticks
+
+    def __len__(self):
+        return self.ticks
+
+    def read_record(self, offset, end=None):
+        """(tipo, campos, datos, offset siguiente) del registro en offset, o None si no está completo."""
+        end = self.records_end if end is None else end
+        if offset + KEYFRAME.size > end: return None
+        kind = self.data[offset:offset + 1]
+        if kind == b'K':
+            if offset + KEYFRAME.size + self.cells > end: return None
+            _, tick = KEYFRAME.unpack_from(self.data, offset)
+            start = offset + KEYFRAME.size
+            return kind, tick, start, start + self.cells
+        if offset + TICK.size > end: return None
+        fields = TICK.unpack_from(self.data, offset)
+        start = offset + TICK.size
+        stop = start + fields[-1] * CELL.size
+        if stop > end: return None
+        return kind, fields, start, stop
+
+    def grid_at(self, offset):
+        return np.frombuffer(self.data[offset:offset + self.cells], dtype=np.int8).reshape(self.height, self.width)
+
+    def keyframe_at(self, tick):
+        # Búsqueda binaria del último keyframe con tick <= tick
+        i = int(np.searchsorted(self.key_ticks, tick, side='right')) - 1
+        return int(self.key_offsets[max(i, 0)])
+
+    def replay(self, start=0):
+        """Itera el estado tick a tick desde start; el mismo ReplayState se actualiza en cada paso."""
+        offset = self.keyframe_at(start)
+        _, _, cells_start, offset = self.read_record(offset)
+        state = ReplayState(self.world_cells, self.grid_at(cells_start), self.height, self.width)
+        while (record := self.read_record(offset)) is not None:
+            kind, fields, cells_start, offset = record
+            if kind == b'K': continue
+            changes = CELL.iter_unpack(self.data[cells_start:offset]) if fields[-1] else ()
+            state.apply(fields, changes)
+            if state.tick >= start: yield state
+
+    def state_at(self, tick):
+        return next(self.replay(tick), None)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+# --- REPRODUCCIÓN ---
+def play(log, speed=1.0, start=0, window=True, web=False, port=None):
+    """Reproduce el log a speed veces el tiempo real, en una ventana pygame y/o en el visor web.
+
+    Ventana: ESPACIO pausa, ←/→ salta 10 s, ↑/↓ dobla o reduce a la mitad la velocidad.
+    """
+    if web:
+        import threading
+        from web_server import start_web_server
+        from publisher import map_publisher
+        threading.Thread(target=start_web_server, args=(port,) if port else (), daemon=True).start()
+    if window:
+        import pygame
+        import drawing
+        from constants import CELL_SIZE, UI_WIDTH
+        # draw_ui lee dimensiones y batería de CONFIG: se ajustan a las del log
+        CONFIG.update({"GRID_WIDTH": log.width, "GRID_HEIGHT": log.height, "battery_capacity": log.battery_capacity})
+        pygame.init()
+        font, small_font = pygame.font.Font(None, 28), pygame.font.Font(None, 20)
+        screen = pygame.display.set_mode((log.width * CELL_SIZE + UI_WIDTH, log.height * CELL_SIZE))
+        ui_rect = pygame.Rect(log.width * CELL_SIZE, 0, UI_WIDTH, log.height * CELL_SIZE)
+
+    def seek(tick):
+        frames = log.replay(max(0, min(tick, len(log) - 1)))
+        state = next(frames, None)
+        renderer = drawing.WorldRenderer(screen, state.world) if window and state else None
+        return frames, state, renderer
+
+    frames, state, renderer = seek(start)
+    if state is None: return
+    position, paused, running = float(state.tick), False, True
+    last = time.perf_counter()
+    while running:
+        now = time.perf_counter()
+        if not paused: position += speed * (now - last) / log.dt
+        last = now
+        target = None
+        if window:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: running = False
+                if event.type == pygame.WINDOWEXPOSED: renderer.full_redraw = True
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE: paused = not paused
+                    elif event.key == pygame.K_RIGHT: target = state.tick + int(10 / log.dt)
+                    elif event.key == pygame.K_LEFT: target = state.tick - int(10 / log.dt)
+                    elif event.key == pygame.K_UP: speed *= 2
+                    elif event.key == pygame.K_DOWN: speed /= 2
+        if target is not None:
+            frames, state, renderer = seek(target)
+            position = float(state.tick)
+        changed = set()
+        while state.tick < int(position):
+            if next(frames, None) is None:
+                # Fin del log: se queda en el último tick
+                position, paused = float(state.tick), True
+                break
+            changed |= state.changed_cells
+        # Una publicación por frame, como el simulador: también congela las instantáneas que pida el visor
+        if web: map_publisher.publish(state.memory, (state.robot.row, state.robot.col), changed)
+
+        if window:
+            dirty = renderer.draw(state.robot)
+            drawing.draw_ui(screen, state.robot, font, small_font, [], log.width, log.height)
+            dirty.append(ui_rect)
+            pygame.display.set_caption(f"Repetición - tick {state.tick}/{len(log) - 1} - x{speed:g}{' (pausa)' if paused else ''}")
+            pygame.display.update(dirty)
+        elif paused and state.tick >= len(log) - 1:
+            # Sin ventana no hay teclas: al llegar al final solo queda el visor web
+            if not web: running = False
+        time.sleep(1 / 60)
+    if window: pygame.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce un log de repetición")
+    parser.add_argument("log", help="fichero grabado con headless.py --replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="multiplicador del tiempo simulado")
+    parser.add_argument("--start", type=int, default=0, help="tick desde el que empezar")
+    parser.add_argument("--web", action="store_true", help="publica la memoria al visor web")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--no-window", action="store_true", help="sin ventana pygame (solo visor web)")
+    args = parser.parse_args()
+
+    log = ReplayLog(args.log)
+    print(f"Semilla {log.seed} | {log.width}x{log.height} | {len(log)} ticks ({len(log) * log.dt:.1f} s) | "
+          f"{len(log.key_ticks)} keyframes")
+    try:
+        play(log, args.speed, args.start, window=not args.no_window, web=args.web, port=args.port)
+    finally:
+        log.close()
+
+if __name__ == '__main__':
+    main()
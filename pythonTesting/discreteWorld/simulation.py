@@ -2,8 +2,9 @@
 import pygame
 from constants import CONFIG, CELL_SIZE, UI_WIDTH
 from world import World, SimulatedRobot
-from utils import Slider
+from slider import Slider
 import drawing
+from tracing import tracer
 
 class Game:
     def __init__(self):
@@ -25,10 +26,11 @@ class Game:
         total_width = screen_width + UI_WIDTH
 
         self.screen = pygame.display.set_mode((total_width, screen_height))
-        pygame.display.set_caption("Simulación de Robot (Visor en Web)")
-
         self.world = World()
+        pygame.display.set_caption(f"Simulación de Robot (Visor en Web) - semilla {self.world.seed}")
         self.robot = SimulatedRobot()
+        self.renderer = drawing.WorldRenderer(self.screen, self.world)
+        self.ui_rect = pygame.Rect(screen_width, 0, UI_WIDTH, screen_height)
         
         self.sliders = [
             Slider(screen_width + 25, 520, UI_WIDTH - 50, 12, 5, 30, CONFIG['GRID_WIDTH'], "Ancho Mundo", 'GRID_WIDTH'),
@@ -45,6 +47,8 @@ class Game:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                if event.type == pygame.WINDOWEXPOSED:
+                    self.renderer.full_redraw = True
                 for slider in self.sliders:
                     slider.handle_event(event)
                 if event.type == pygame.KEYDOWN:
@@ -60,14 +64,14 @@ class Game:
                     self.simulation_running = False
 
             # --- DIBUJADO ---
-            self.screen.fill(drawing.COLOR_BG)
-            drawing.draw_world(self.screen, self.world)
-            drawing.draw_grid(self.screen, self.applied_grid_width * CELL_SIZE, self.applied_grid_height * CELL_SIZE)
-            drawing.draw_path(self.screen, self.robot)
-            drawing.draw_vision_cone(self.screen, self.robot)
-            drawing.draw_robot(self.screen, self.robot)
-            drawing.draw_ui(self.screen, self.robot, self.font, self.small_font, self.sliders, self.applied_grid_width, self.applied_grid_height)
+            # Solo se envían a pantalla las zonas que cambiaron y el panel lateral
+            with tracer.span("draw_world", "draw"):
+                dirty = self.renderer.draw(self.robot)
+            with tracer.span("draw_ui", "draw"):
+                drawing.draw_ui(self.screen, self.robot, self.font, self.small_font, self.sliders, self.applied_grid_width, self.applied_grid_height)
+            dirty.append(self.ui_rect)
 
-            pygame.display.flip()
+            with tracer.span("display_update", "draw"):
+                pygame.display.update(dirty)
         
         pygame.quit()
\ No newline at end of file
@@ -0,0 +1,38 @@
+# slider.py
+import pygame
+from constants import CONFIG, COLOR_ROBOT, COLOR_TEXT
+
+class Slider:
+    def __init__(self, x, y, w, h, min_val, max_val, initial_val, label, config_key):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.min_val, self.max_val, self.val = min_val, max_val, initial_val
+        self.label, self.config_key = label, config_key
+        self.grabbed = False
+        self.update_config()
+    def update_config(self):
+        if isinstance(CONFIG[self.config_key], int):
+            self.val = int(round(self.val))
+        CONFIG[self.config_key] = self.val
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
+            self.grabbed = True
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.grabbed = False
+        elif event.type == pygame.MOUSEMOTION and self.grabbed:
+            mouse_x = event.pos[0]
+            new_val = (mouse_x - self.rect.x) / self.rect.width
+            self.val = self.min_val + new_val * (self.max_val - self.min_val)
+            self.val = max(self.min_val, min(self.max_val, self.val))
+            self.update_config()
+
+    def draw(self, screen, font):
+        label_surf = font.render(f"{self.label}: {self.val:.1f}", True, COLOR_TEXT)
+        screen.blit(label_surf, (self.rect.x, self.rect.y - 22))
+        pygame.draw.rect(screen, (30, 30, 40), self.rect)
+        pygame.draw.rect(screen, (80, 80, 90), self.rect, 1)
+        handle_x = self.rect.x + (self.val - self.min_val) / (self.max_val - self.min_val) * self.rect.width
+        pygame.draw.circle(screen, COLOR_ROBOT, (int(handle_x), self.rect.centery), 8)
+
+
+    pass
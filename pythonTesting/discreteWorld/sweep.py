@@ -0,0 +1,147 @@
+# sweep.py
+# Barrido de parámetros de CONFIG: cada misión corre sin interfaz en un proceso del pool.
+import argparse
+import csv
+import itertools
+import os
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from constants import CONFIG
+from headless import run_mission
+
+RESULT_COLUMNS = ["outcome", "mission_time", "steps", "gnomes_delivered", "gnomes_total",
+                  "battery_final", "steps_per_second", "wall_time", "error"]
+
+# --- GENERACIÓN DE COMBINACIONES ---
+def cast_value(key, text):
+    default = CONFIG['GRID_WIDTH'] if key == 'grid_size' else CONFIG[key]
+    if isinstance(default, str): return text
+    return int(text) if isinstance(default, int) else float(text)
+
+def expand_grid_size(overrides):
+    # 'grid_size' es un atajo para barrer mundos cuadrados
+    if 'grid_size' in overrides:
+        size = overrides.pop('grid_size')
+        overrides['GRID_WIDTH'], overrides['GRID_HEIGHT'] = size, size
+    return overrides
+
+def grid_overrides(values):
+    keys = list(values)
+    return [expand_grid_size(dict(zip(keys, combo))) for combo in itertools.product(*(values[k] for k in keys))]
+
+def random_overrides(ranges, samples, rng):
+    overrides = []
+    for _ in range(samples):
+        sample = {}
+        for key, (low, high) in ranges.items():
+            sample[key] = rng.randint(low, high) if isinstance(low, int) else rng.uniform(low, high)
+        overrides.append(expand_grid_size(sample))
+    return overrides
+
+# --- EJECUCIÓN ---
+def run_task(task):
+    overrides, seed, dt, max_time = task
+    result = run_mission(overrides, dt=dt, max_time=max_time, seed=seed)
+    return {column: result.get(column, "") for column in RESULT_COLUMNS}
+
+def run_isolated(task):
+    # Un pool de un solo proceso dice con certeza si esta tarea es la que tumba al worker
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(run_task, task).result()
+        except BrokenProcessPool:
+            return {"outcome": "CRASH", "error": "el proceso del worker terminó de forma abrupta"}
+        except Exception as e:
+            return {"outcome": "ERROR", "error": repr(e)}
+
+def run_sweep(tasks, out_path, workers=None, on_result=None):
+    workers = workers or os.cpu_count()
+    config_keys = sorted({key for overrides, _, _, _ in tasks for key in overrides})
+    pending, suspects, done = list(reversed(tasks)), [], 0
+
+    with open(out_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=["seed"] + config_keys + RESULT_COLUMNS, restval="")
+        writer.writeheader()
+
+        def write_row(task, row):
+            nonlocal done
+            overrides, seed, _, _ = task
+            writer.writerow({"seed": seed, **overrides, **row})
+            f.flush()
+            done += 1
+            if on_result: on_result(done, len(tasks), row)
+
+        while pending:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            in_flight = {}
+            try:
+                # Ventana acotada: pocas tareas en vuelo para que un fallo arrastre a pocas
+                while pending or in_flight:
+                    while pending and len(in_flight) < workers * 2:
+                        in_flight[pool.submit(run_task, pending[-1])] = pending[-1]
+                        pending.pop()
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        task = in_flight.pop(future)
+                        try:
+                            write_row(task, future.result())
+                        except BrokenProcessPool:
+                            suspects.append(task)
+                        except Exception as e:
+                            write_row(task, {"outcome": "ERROR", "error": repr(e)})
+            except BrokenProcessPool:
+                suspects.extend(in_flight.values())
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            # Las tareas que estaban en vuelo cuando murió un worker se repiten aisladas
+            for task in suspects:
+                write_row(task, run_isolated(task))
+            suspects = []
+    return done
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de CONFIG en paralelo")
+    parser.add_argument("--grid", nargs="*", default=[], metavar="CLAVE=v1,v2",
+                        help="valores a combinar en rejilla (producto cartesiano)")
+    parser.add_argument("--random", nargs="*", default=[], metavar="CLAVE=min:max",
+                        help="rangos para muestreo aleatorio uniforme")
+    parser.add_argument("--samples", type=int, default=20, help="número de muestras con --random")
+    parser.add_argument("--seeds", type=int, default=5, help="semillas (mundos) por combinación")
+    parser.add_argument("--base-seed", type=int, default=0, help="semilla raíz de la que se derivan las de cada mundo")
+    parser.add_argument("--dt", type=float, default=1/60)
+    parser.add_argument("--max-time", type=float, default=3600.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep_results.csv")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    values = {}
+    for spec in args.grid:
+        key, text = spec.split("=", 1)
+        values[key] = [cast_value(key, v) for v in text.split(",")]
+    ranges = {}
+    for spec in args.random:
+        key, text = spec.split("=", 1)
+        low, high = text.split(":")
+        ranges[key] = (cast_value(key, low), cast_value(key, high))
+
+    combos = grid_overrides(values) if values else [{}]
+    if ranges:
+        sampled = random_overrides(ranges, args.samples, random.Random(args.base_seed))
+        combos = [{**a, **b} for a in combos for b in sampled]
+    # Todas las combinaciones se prueban sobre los mismos mundos; cada mundo tiene un flujo
+    # independiente derivado de la semilla raíz, y su semilla queda en el CSV para repetirlo
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(args.base_seed).spawn(args.seeds)]
+    tasks = [(overrides, seed, args.dt, args.max_time) for overrides in combos for seed in seeds]
+
+    print(f"Ejecutando {len(tasks)} misiones con {args.workers or os.cpu_count()} procesos -> {args.out}")
+    def progress(done, total, row):
+        print(f"[{done}/{total}] {row.get('outcome')} gnomos={row.get('gnomes_delivered')} t={row.get('mission_time')}")
+    run_sweep(tasks, args.out, args.workers, progress)
+
+if __name__ == '__main__':
+    main()
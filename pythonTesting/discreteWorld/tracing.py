@@ -0,0 +1,96 @@
+# tracing.py
+# Trazas por fase del tick en un búfer circular, exportables al formato trace-event de Chrome
+# (chrome://tracing o https://ui.perfetto.dev). Desactivado solo cuesta comprobar tracer.enabled.
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_CAPACITY = 200_000
+
+class NoSpan:
+    # Contexto vacío compartido: lo que devuelve span() con las trazas desactivadas
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+NO_SPAN = NoSpan()
+
+class Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer, self.name, self.cat, self.args = tracer, name, cat, args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.cat, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+class Tracer:
+    """Tramos (nombre, categoría, inicio, duración, hilo) de las últimas capacity fases.
+
+    El búfer es un deque con maxlen: al llenarse se descartan los tramos más
+    antiguos, así que una sesión larga guarda siempre los últimos ticks.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+        self.thread_names = {}
+        self.origin = time.perf_counter_ns()
+
+    def enable(self, capacity=None):
+        if capacity is not None and capacity != self.events.maxlen:
+            self.events = deque(self.events, maxlen=capacity)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events.clear()
+
+    def span(self, name, cat="sim", args=None):
+        if not self.enabled: return NO_SPAN
+        return Span(self, name, cat, args)
+
+    def traced(self, name, cat="sim"):
+        """Decorador: un tramo por llamada; desactivado llama directamente a la función."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled: return func(*args, **kwargs)
+                with Span(self, name, cat, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, cat, start, end, args=None):
+        # deque.append es atómico: el hilo de la simulación y los del servidor web escriben sin lock
+        thread = threading.get_ident()
+        if thread not in self.thread_names: self.thread_names[thread] = threading.current_thread().name
+        self.events.append((name, cat, start, end - start, thread, args))
+
+    def chrome_trace(self):
+        """Diccionario trace-event de Chrome: un evento completo ("X") por tramo, tiempos en µs."""
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+                  for thread, name in list(self.thread_names.items())]
+        for name, cat, start, duration, thread, args in list(self.events):
+            event = {"name": name, "cat": cat, "ph": "X", "pid": pid, "tid": thread,
+                     "ts": (start - self.origin) / 1000, "dur": duration / 1000}
+            if args: event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return len(self.events)
+
+tracer = Tracer()
@@ -1,84 +1,47 @@
 # utils.py
-import pygame
 import heapq
-from constants import CONFIG, MEM_OBSTACLE, MEM_UNKNOWN, MEM_SLOW, COLOR_ROBOT, COLOR_TEXT
+import math
+import numpy as np
+from constants import CONFIG, MEM_OBSTACLE, MEM_UNKNOWN, MEM_SLOW
 
-class Node:
-    def __init__(self, position, parent=None):
-        self.position, self.parent = position, parent
-        self.g, self.h, self.f = 0, 0, 0
-    def __eq__(self, other): return self.position == other.position
-    def __lt__(self, other): return self.f < other.f
-    def __repr__(self): return f"Node({self.position})"
-    pass
+def find_path_astar(memory_grid, start, end, slow_cost=None):
+    # A* con tabla de mejor g por celda y borrado perezoso en el heap:
+    # las entradas obsoletas se descartan al sacarlas en vez de buscarlas.
+    # Las celdas se identifican por su índice plano r * width + c.
+    height, width, flat = memory_grid.height, memory_grid.width, memory_grid.flat
+    if slow_cost is None: slow_cost = CONFIG["cost_slow_cell"]
+    end_r, end_c = end
+    start_i, end_i = start[0] * width + start[1], end_r * width + end_c
+    best_g, parents, closed = {start_i: 0}, {start_i: None}, set()
+    h = abs(start[0] - end_r) + abs(start[1] - end_c)
+    open_heap = [(h, h, start_i)]
 
-class Slider:
-    def __init__(self, x, y, w, h, min_val, max_val, initial_val, label, config_key):
-        self.rect = pygame.Rect(x, y, w, h)
-        self.min_val, self.max_val, self.val = min_val, max_val, initial_val
-        self.label, self.config_key = label, config_key
-        self.grabbed = False
-        self.update_config()
-    def update_config(self):
-        if isinstance(CONFIG[self.config_key], int):
-            self.val = int(round(self.val))
-        CONFIG[self.config_key] = self.val
-
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
-            self.grabbed = True
-        elif event.type == pygame.MOUSEBUTTONUP:
-            self.grabbed = False
-        elif event.type == pygame.MOUSEMOTION and self.grabbed:
-            mouse_x = event.pos[0]
-            new_val = (mouse_x - self.rect.x) / self.rect.width
-            self.val = self.min_val + new_val * (self.max_val - self.min_val)
-            self.val = max(self.min_val, min(self.max_val, self.val))
-            self.update_config()
-
-    def draw(self, screen, font):
-        label_surf = font.render(f"{self.label}: {self.val:.1f}", True, COLOR_TEXT)
-        screen.blit(label_surf, (self.rect.x, self.rect.y - 22))
-        pygame.draw.rect(screen, (30, 30, 40), self.rect)
-        pygame.draw.rect(screen, (80, 80, 90), self.rect, 1)
-        handle_x = self.rect.x + (self.val - self.min_val) / (self.max_val - self.min_val) * self.rect.width
-        pygame.draw.circle(screen, COLOR_ROBOT, (int(handle_x), self.rect.centery), 8)
-
-
-    pass
-
-def find_path_astar(memory_grid, start, end):
-    start_node, end_node = Node(start), Node(end)
-    open_list, closed_list = [], set()
-    heapq.heappush(open_list, start_node)
-    
-    while open_list:
-        current_node = heapq.heappop(open_list)
-        closed_list.add(current_node.position)
-        if current_node == end_node:
+    while open_heap:
+        f, h, i = heapq.heappop(open_heap)
+        if i in closed:
+            continue
+        closed.add(i)
+        if i == end_i:
             path = []
-            current = current_node
-            while current is not None:
-                path.append(current.position)
-                current = current.parent
+            while i is not None:
+                path.append(divmod(i, width))
+                i = parents[i]
             return path[::-1]
-        
-        (r, c) = current_node.position
-        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            neighbor_pos = (r + dr, c + dc)
-            if not (0 <= neighbor_pos[0] < CONFIG['GRID_HEIGHT'] and 0 <= neighbor_pos[1] < CONFIG['GRID_WIDTH']) or \
-               memory_grid[neighbor_pos[0]][neighbor_pos[1]] in [MEM_OBSTACLE, MEM_UNKNOWN] or \
-               neighbor_pos in closed_list:
+
+        g = f - h
+        r, c = divmod(i, width)
+        for ni, nr, nc in ((i + 1, r, c + 1), (i - 1, r, c - 1), (i + width, r + 1, c), (i - width, r - 1, c)):
+            if not (0 <= nr < height and 0 <= nc < width):
                 continue
-            
-            cost = CONFIG["cost_slow_cell"] if memory_grid[neighbor_pos[0]][neighbor_pos[1]] == MEM_SLOW else 1
-            neighbor_node = Node(neighbor_pos, current_node)
-            neighbor_node.g = current_node.g + cost
-            neighbor_node.h = abs(neighbor_pos[0] - end_node.position[0]) + abs(neighbor_pos[1] - end_node.position[1])
-            neighbor_node.f = neighbor_node.g + neighbor_node.h
-            if any(n for n in open_list if neighbor_node == n and neighbor_node.g >= n.g):
+            cell = flat[ni]
+            if cell == MEM_OBSTACLE or cell == MEM_UNKNOWN or ni in closed:
                 continue
-            heapq.heappush(open_list, neighbor_node)
+            new_g = g + (slow_cost if cell == MEM_SLOW else 1)
+            if new_g >= best_g.get(ni, math.inf):
+                continue
+            best_g[ni], parents[ni] = new_g, i
+            nh = abs(nr - end_r) + abs(nc - end_c)
+            heapq.heappush(open_heap, (new_g + nh, nh, ni))
     return None
 
 def bresenham_line(start, end):
@@ -101,3 +64,40 @@ def bresenham_line(start, end):
             err += dx
             y0 += sy
     return points
+
+def connected_component(passable, start):
+    """Máscara de las celdas alcanzables desde start moviéndose en 4 direcciones por celdas passable.
+
+    Se trabaja por tramos horizontales de celdas libres: dos tramos de filas
+    contiguas que comparten columna están conectados. Las componentes salen de
+    enganchar cada raíz a la menor de sus vecinas y acortar punteros hasta que
+    nada cambia (pocas pasadas vectorizadas, sin recorrer celda a celda).
+    """
+    passable = np.asarray(passable, dtype=bool)
+    if not passable[start]: return np.zeros_like(passable)
+    height, width = passable.shape
+    # Identificador de tramo por celda: cuenta acumulada de inicios de tramo
+    starts = passable.copy()
+    starts[:, 1:] &= ~passable[:, :-1]
+    run_id = np.cumsum(starts.ravel(), dtype=np.int32).reshape(height, width) - 1
+
+    # Una arista por cada solape entre tramos de filas contiguas (no una por celda)
+    vertical = passable[:-1] & passable[1:]
+    first = vertical.copy()
+    first[:, 1:] &= ~vertical[:, :-1] | starts[:-1, 1:] | starts[1:, 1:]
+    a, b = run_id[:-1][first], run_id[1:][first]
+
+    parent = np.arange(int(run_id.ravel()[-1]) + 1, dtype=np.int32)
+    while True:
+        pa, pb = parent[a], parent[b]
+        low, high = np.minimum(pa, pb), np.maximum(pa, pb)
+        hooks = low != high
+        if not hooks.any(): break
+        np.minimum.at(parent, high[hooks], low[hooks])
+        # Salto de punteros hasta que cada tramo apunte a su raíz
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent): break
+            parent = grand
+    labels = parent[run_id]
+    return passable & (labels == labels[start])
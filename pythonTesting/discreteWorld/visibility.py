@@ -0,0 +1,38 @@
+# visibility.py
+import math
+from functools import lru_cache
+from utils import bresenham_line
+
+HEADINGS = (0, math.pi/2, math.pi, -math.pi/2)
+
+def view_offsets(max_dist, heading):
+    base_pattern = sorted((r, c) for r in range(-max_dist, max_dist + 1) for c in range(1, max_dist + 1) if abs(r) <= c)
+    if heading == 0: return base_pattern
+    if heading == math.pi/2: return [(-c, r) for r, c in base_pattern]
+    if heading == math.pi: return [(-r, -c) for r, c in base_pattern]
+    return [(c, -r) for r, c in base_pattern]
+
+@lru_cache(maxsize=None)
+def visibility_kernel(max_dist, heading):
+    """Rayos del cono de visión como un árbol aplanado con saltos.
+
+    Las líneas de Bresenham hacia cada celda del cono comparten prefijos, así
+    que se fusionan en un árbol (ordenado por distancia) y se aplanan en
+    recorrido en profundidad. skips[i] apunta al primer nodo fuera del
+    subárbol de i: si la celda i bloquea la vista, se salta todo lo que hay detrás.
+    """
+    trie = {}
+    for dr, dc in view_offsets(max_dist, heading):
+        node = trie
+        for step in bresenham_line((0, 0), (dr, dc))[1:]:
+            node = node.setdefault(step, {})
+
+    drs, dcs, skips = [], [], []
+    def flatten(node):
+        for offset in sorted(node, key=lambda o: (o[0]**2 + o[1]**2, o)):
+            index = len(drs)
+            drs.append(offset[0]); dcs.append(offset[1]); skips.append(None)
+            flatten(node[offset])
+            skips[index] = len(drs)
+    flatten(trie)
+    return tuple(drs), tuple(dcs), tuple(skips)
@@ -2,34 +2,100 @@
 import http.server
 import socketserver
 import json
-from constants import shared_data, data_lock, CONFIG, WEB_SERVER_PORT
+import time
+from urllib.parse import urlsplit, parse_qs
+from constants import data_lock, CONFIG, WEB_SERVER_PORT
+from publisher import map_publisher
+from tracing import tracer
+
+STREAM_MIN_INTERVAL = 0.05
+STREAM_KEEPALIVE = 15
+SNAPSHOT_WAIT = 0.03  # algo más de un tick a 60 Hz: lo que tarda el simulador en congelar una instantánea al día
 
 class RequestHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1: los visores que sondean reutilizan la conexión en vez de abrir una por petición
+    protocol_version = "HTTP/1.1"
+
     def do_GET(self):
         if self.path == '/':
             self.path = '/index.html'
             return http.server.SimpleHTTPRequestHandler.do_GET(self)
 
         if self.path == '/mapdata':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            with data_lock:
-                self.wfile.write(json.dumps(shared_data).encode('utf-8'))
-            return
+            # Instantánea inmutable ya congelada por el simulador: ni locks ni rejilla a medio escribir
+            with tracer.span("GET /mapdata", "web"):
+                return self.send_body(map_publisher.snapshot_json(SNAPSHOT_WAIT))
+
+        url = urlsplit(self.path)
+        if url.path == '/mapdata.bin':
+            # Celdas int8 sin JSON; ?rle=1 las agrupa en runs (mapas grandes con mucho desconocido)
+            rle = parse_qs(url.query).get('rle', ['0'])[0] == '1'
+            with tracer.span("GET /mapdata.bin", "web"):
+                return self.send_body(map_publisher.snapshot_binary(rle, SNAPSHOT_WAIT), 'application/octet-stream')
+
+        if self.path == '/stream':
+            return self.stream_map()
 
         if self.path == '/config':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            with data_lock:
-                self.wfile.write(json.dumps(CONFIG.copy()).encode('utf-8'))
-            return
+            with tracer.span("GET /config", "web"):
+                with data_lock:
+                    config = CONFIG.copy()
+                return self.send_json(config)
         
         return http.server.SimpleHTTPRequestHandler.do_GET(self)
 
-def start_web_server():
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", WEB_SERVER_PORT), RequestHandler) as httpd:
-        print(f"Servidor web iniciado en http://localhost:{WEB_SERVER_PORT}")
+    def send_json(self, data):
+        self.send_body(json.dumps(data).encode('utf-8'))
+
+    def send_body(self, body, content_type='application/json'):
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_event(self, event, data):
+        # Un tramo por mensaje: la conexión de /stream dura lo que el visor esté abierto
+        with tracer.span(f"SSE {event}", "web"):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+    def stream_map(self):
+        # Server-Sent Events: instantánea al conectar y después solo los cambios
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        version = None
+        try:
+            while True:
+                if version is not None and not map_publisher.wait_for_change(version, timeout=STREAM_KEEPALIVE):
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                delta = None if version is None else map_publisher.changes_since(version)
+                if delta is not None:
+                    self.send_event('delta', delta)
+                    version = delta["version"]
+                elif (snapshot := map_publisher.latest_snapshot()) is not None and snapshot.version:
+                    # Solo el aviso: el visor descarga las celdas de /mapdata.bin
+                    self.send_event('snapshot', {"version": snapshot.version, "grid_width": snapshot.width,
+                                                 "grid_height": snapshot.height, "robot_pos": list(snapshot.robot_pos)})
+                    version = snapshot.version
+                # Agrupa los ticks de la simulación en como mucho un mensaje por intervalo
+                time.sleep(STREAM_MIN_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+class WebServer(socketserver.ThreadingTCPServer):
+    # Un hilo por conexión; la cola de escucha admite decenas de visores a la vez
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 128
+
+def start_web_server(port=WEB_SERVER_PORT):
+    with WebServer(("", port), RequestHandler) as httpd:
+        print(f"Servidor web iniciado en http://localhost:{port}")
         httpd.serve_forever()
\ No newline at end of file
@@ -1,121 +1,188 @@
 # world.py
 import math
-import random
-from constants import CONFIG, MEM_UNKNOWN, MEM_OBSTACLE, data_lock, shared_data
-from utils import find_path_astar, bresenham_line
+import numpy as np
+from constants import CONFIG, VIEW_RANGE, MEM_UNKNOWN, MEM_OBSTACLE, MEM_GNOME
+from utils import find_path_astar, connected_component
+from grid import Grid
+from visibility import HEADINGS, view_offsets, visibility_kernel
+from dstar_lite import DStarLite
+from mission_planner import MissionPlanner
+from home_field import HomeEnergyField
+from frontier import FrontierSet
+from publisher import map_publisher
+from tracing import tracer
 
 class World:
-    def __init__(self):
-        self.width, self.height = CONFIG['GRID_WIDTH'], CONFIG['GRID_HEIGHT']
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+    def __init__(self, config=None, seed=None, rng=None):
+        self.config = CONFIG if config is None else config
+        self.width, self.height = self.config['GRID_WIDTH'], self.config['GRID_HEIGHT']
+        # Generador propio de la simulación: sin semilla se saca una nueva de la entropía
+        # del sistema y se guarda, para poder repetir exactamente este mundo
+        if seed is None and rng is None: seed = int(np.random.SeedSequence().generate_state(1)[0])
+        self.seed = seed
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.grid = Grid(self.height, self.width)
         self.gnomes = []
         self.home_base = (0, 0)
-        if self.home_base[0] < self.height and self.home_base[1] < self.width:
-            self.grid[self.home_base[0]][self.home_base[1]] = 3
+        if self.grid.in_bounds(*self.home_base):
+            self.grid[self.home_base] = 3
         self.generate_world_elements()
 
     def generate_world_elements(self):
-        self.grid = [[0 if (r, c) != self.home_base else 3 for c in range(self.width)] for r in range(self.height)]
-        self.gnomes = []
-        
-        for _ in range(CONFIG["num_obstacles"]):
-            while True:
-                r, c = random.randint(0, self.height - 1), random.randint(0, self.width - 1)
-                if self.grid[r][c] == 0 and math.dist((r, c), self.home_base) > 2:
-                    self.grid[r][c] = 1
-                    break
-        for _ in range(CONFIG["num_slow_cells"]):
-            while True:
-                r, c = random.randint(0, self.height - 1), random.randint(0, self.width - 1)
-                if self.grid[r][c] == 0:
-                    self.grid[r][c] = 4
-                    break
-        for _ in range(CONFIG["num_gnomes"]):
-            while True:
-                r, c = random.randint(0, self.height - 1), random.randint(0, self.width - 1)
-                if self.grid[r][c] == 0:
-                    self.grid[r][c] = 2
-                    self.gnomes.append((r, c))
-                    break
+        # Muestreo sin reemplazo sobre las celdas libres: sin bucles de reintento y
+        # siempre termina; si no caben todos los elementos se colocan los que quepan.
+        self.grid = Grid(self.height, self.width)
+        self.grid[self.home_base] = 3
+        cells = self.grid.array.reshape(-1)
+
+        # Obstáculos: lejos de la base (distancia > 2) para no encerrarla de entrada
+        free = cells == 0
+        home_r, home_c = self.home_base
+        for r in range(max(0, home_r - 2), min(self.height, home_r + 3)):
+            for c in range(max(0, home_c - 2), min(self.width, home_c + 3)):
+                if math.dist((r, c), self.home_base) <= 2: free[r * self.width + c] = False
+        candidates = np.flatnonzero(free)
+        count = min(self.config["num_obstacles"], candidates.size)
+        cells[self.rng.choice(candidates, count, replace=False)] = 1
+
+        # Terreno lento en cualquier celda libre
+        candidates = np.flatnonzero(cells == 0)
+        count = min(self.config["num_slow_cells"], candidates.size)
+        cells[self.rng.choice(candidates, count, replace=False)] = 4
+
+        # Gnomos solo donde se puede llegar desde la base (y volver a ella)
+        reachable = connected_component(self.grid.array != 1, self.home_base).reshape(-1)
+        candidates = np.flatnonzero((cells == 0) & reachable)
+        count = min(self.config["num_gnomes"], candidates.size)
+        placed = self.rng.choice(candidates, count, replace=False)
+        cells[placed] = 2
+        self.gnomes = [divmod(int(i), self.width) for i in placed]
 
 class SimulatedRobot:
-    def __init__(self):
+    def __init__(self, config=None, publish=True, memory_grid=None, frontier=None):
+        # memory_grid y frontier permiten compartir memoria y fronteras entre robots (flota)
+        self.config = CONFIG if config is None else config
+        self.publish = publish
         self.row, self.col, self.theta = 0, 0, 0.0
         self.action, self.path, self.state = 'ESPERANDO', [], 'BUSCANDO'
         self.animation_progress = 0.0
-        self.battery, self.inventory = CONFIG["battery_capacity"], []
+        self.battery, self.inventory = self.config["battery_capacity"], []
+        self.delivered = 0
         self.discovered_gnomes, self.potential_decisions = set(), []
         self.patrol_points, self.patrol_index = self.generate_patrol_points(), 0
+        # En modo 'frontier' se explora hacia lo desconocido en vez de recorrer la patrulla
+        self.frontier = None
         self.current_target_pos, self.saved_state, self.saved_target_pos = None, None, None
         self.target_theta = 0.0
         self.view_pattern = self.generate_view_pattern()
-        self.memory_grid = [[MEM_UNKNOWN for _ in range(CONFIG['GRID_WIDTH'])] for _ in range(CONFIG['GRID_HEIGHT'])]
+        self.memory_grid = memory_grid if memory_grid is not None else Grid(self.config['GRID_HEIGHT'], self.config['GRID_WIDTH'], MEM_UNKNOWN)
+        if frontier is not None: self.frontier = frontier
+        elif self.config.get("exploration") == 'frontier': self.frontier = FrontierSet(self.memory_grid)
+        self.changed_cells, self.planners = set(), {}
+        self.last_los_pose = None
+        # En modo 'tour' se planifican viajes con todos los gnomos conocidos; en 'greedy', uno a uno
+        self.mission_planner = None
+        self.home_field = None
 
     def generate_view_pattern(self):
-        base_pattern = set()
-        max_dist = 4
-        for r in range(-max_dist, max_dist + 1):
-            for c in range(1, max_dist + 1):
-                if abs(r) <= c:
-                    base_pattern.add((r, c))
-        return {
-            0: list(base_pattern),
-            math.pi/2: [(-c, r) for r, c in base_pattern],
-            math.pi: [(-r, -c) for r, c in base_pattern],
-            -math.pi/2: [(c, -r) for r, c in base_pattern]
-        }
+        return {heading: view_offsets(VIEW_RANGE, heading) for heading in HEADINGS}
 
     def generate_patrol_points(self):
         points = []
-        for r in range(CONFIG['GRID_HEIGHT']):
-            row_points = range(CONFIG['GRID_WIDTH']) if r % 2 == 0 else range(CONFIG['GRID_WIDTH'] - 1, -1, -1)
+        for r in range(self.config['GRID_HEIGHT']):
+            row_points = range(self.config['GRID_WIDTH']) if r % 2 == 0 else range(self.config['GRID_WIDTH'] - 1, -1, -1)
             for c in row_points:
                 points.append((r, c))
         return points
 
+    def reveal_cell(self, world, r, c):
+        value = world.grid.cells[r, c]
+        if self.memory_grid.cells[r, c] != value:
+            self.memory_grid.cells[r, c] = value
+            self.changed_cells.add((r, c))
+
     def update_memory_with_los(self, world):
-        self.memory_grid[self.row][self.col] = world.grid[self.row][self.col]
+        self.changed_cells = set()
+        # La celda propia se refresca siempre (el robot recoge gnomos donde está);
+        # el resto del cono solo cambia si cambia la pose.
+        self.reveal_cell(world, self.row, self.col)
+        pose = (self.row, self.col, self.theta)
+        if pose == self.last_los_pose: return
+        self.last_los_pose = pose
+
         closest_theta_key = min(self.view_pattern.keys(), key=lambda k: abs(k - self.theta))
-        
-        for dr, dc in self.view_pattern.get(closest_theta_key, []):
-            target_r, target_c = self.row + dr, self.col + dc
-            if not (0 <= target_r < CONFIG['GRID_HEIGHT'] and 0 <= target_c < CONFIG['GRID_WIDTH']):
+        drs, dcs, skips = visibility_kernel(VIEW_RANGE, closest_theta_key)
+        height, width = self.memory_grid.shape
+        memory_cells, world_cells = self.memory_grid.cells, world.grid.cells
+        i, n = 0, len(drs)
+        while i < n:
+            r, c = self.row + drs[i], self.col + dcs[i]
+            # Los rayos son monótonos: si una celda se sale del mapa, el resto del rayo también
+            if not (0 <= r < height and 0 <= c < width):
+                i = skips[i]
                 continue
-            
-            line = bresenham_line((self.row, self.col), (target_r, target_c))
-            for r, c in line:
-                self.memory_grid[r][c] = world.grid[r][c]
-                if self.memory_grid[r][c] == MEM_OBSTACLE and (r, c) != (self.row, self.col):
-                    break
+            value = world_cells[r, c]
+            if memory_cells[r, c] != value:
+                memory_cells[r, c] = value
+                self.changed_cells.add((r, c))
+            i = skips[i] if value == MEM_OBSTACLE else i + 1
 
     def scan_for_gnomes(self, world):
         visible_gnomes = set()
         closest_theta_key = min(self.view_pattern.keys(), key=lambda k: abs(k - self.theta))
         for dr, dc in self.view_pattern.get(closest_theta_key, []):
             check_r, check_c = self.row + dr, self.col + dc
-            if 0 <= check_r < CONFIG['GRID_HEIGHT'] and 0 <= check_c < CONFIG['GRID_WIDTH']:
-                if world.grid[check_r][check_c] == 2 and (check_r, check_c) not in self.discovered_gnomes:
+            if 0 <= check_r < self.config['GRID_HEIGHT'] and 0 <= check_c < self.config['GRID_WIDTH']:
+                if world.grid[check_r, check_c] == 2 and (check_r, check_c) not in self.discovered_gnomes:
                     visible_gnomes.add((check_r, check_c))
         return list(visible_gnomes)
 
+    def plan_path(self, goal, start=None):
+        planner = self.planners.get(goal)
+        if planner is None:
+            planner = self.planners[goal] = DStarLite(self.memory_grid, goal, self.config["cost_slow_cell"])
+        with tracer.span("plan_path"):
+            return planner.plan(start or (self.row, self.col))
+
+    def update_planners(self, world):
+        # Solo se conservan los planificadores de metas que pueden volver a usarse
+        keep = {world.home_base, self.current_target_pos, self.saved_target_pos}
+        self.planners = {goal: p for goal, p in self.planners.items() if goal in keep}
+        for planner in self.planners.values():
+            planner.notify_changes(self.changed_cells)
+        planner = self.planners.get(self.current_target_pos)
+        if self.path and planner and self.changed_cells and planner.path_blocked(self.path):
+            self.path = self.plan_path(self.current_target_pos)
+            self.animation_progress = 0.0
+            if self.path: self.start_next_path_step()
+            else: self.action = 'ESPERANDO'
+
+    def update_maps(self, world, changed_cells):
+        # Estructuras derivadas de la memoria que no dependen de dónde esté el robot
+        if self.mission_planner: self.mission_planner.notify_changes(changed_cells)
+        if self.home_field is None: self.home_field = HomeEnergyField(self.memory_grid, world.home_base, self.config)
+        self.home_field.update(changed_cells)
+        if self.frontier is not None: self.frontier.update(changed_cells)
+
     def update(self, world, dt):
-        self.update_memory_with_los(world)
-        self.update_logic(world, dt)
-        self.execute_movement(world, dt)
-        with data_lock:
-            shared_data["memory_grid"] = self.memory_grid
-            shared_data["robot_pos"] = [self.row, self.col]
-            shared_data["grid_width"] = CONFIG['GRID_WIDTH']
-            shared_data["grid_height"] = CONFIG['GRID_HEIGHT']
+        # Cada fase en su tramo dentro del tramo del tick; sin trazas, span() devuelve un contexto vacío
+        with tracer.span("tick", args={"state": self.state, "action": self.action}):
+            with tracer.span("los"): self.update_memory_with_los(world)
+            with tracer.span("maps"): self.update_maps(world, self.changed_cells)
+            with tracer.span("planners"): self.update_planners(world)
+            with tracer.span("logic"): self.update_logic(world, dt)
+            with tracer.span("movement"): self.execute_movement(world, dt)
+            if self.publish:
+                with tracer.span("publish"): map_publisher.publish(self.memory_grid, (self.row, self.col), self.changed_cells)
 
     def execute_movement(self, world, dt):
         if self.action == 'ESPERANDO': return
-        drain = CONFIG["drain_base"] * dt
-        if self.action == 'GIRANDO': drain += CONFIG["drain_turn"] * dt
-        elif self.action == 'MOVIENDOSE': drain += CONFIG["drain_move"] * dt
-        if world.grid[self.row][self.col] == 4: drain *= CONFIG["drain_slow_modifier"]
+        drain = self.config["drain_base"] * dt
+        if self.action == 'GIRANDO': drain += self.config["drain_turn"] * dt
+        elif self.action == 'MOVIENDOSE': drain += self.config["drain_move"] * dt
+        if world.grid[self.row, self.col] == 4: drain *= self.config["drain_slow_modifier"]
         self.battery = max(0, self.battery - drain)
-        self.animation_progress += CONFIG["animation_speed"] * dt
+        self.animation_progress += self.config["animation_speed"] * dt
         if self.animation_progress >= 1.0:
             self.animation_progress %= 1.0
             if self.action == 'GIRANDO': self.theta = self.target_theta
@@ -134,40 +201,145 @@ class SimulatedRobot:
         if abs(angle_diff) > 0.1: self.action = 'GIRANDO'
         else: self.action = 'MOVIENDOSE'
 
-    def update_logic(self, world, dt):
-        if self.battery <= CONFIG["battery_low_threshold"] and self.state not in ['VOLVIENDO_A_CASA', 'CARGANDO']:
-            self.saved_state, self.saved_target_pos = self.state, self.current_target_pos
-            self.current_target_pos = world.home_base
-            self.path = find_path_astar(self.memory_grid, (self.row, self.col), self.current_target_pos)
-            self.state = 'VOLVIENDO_A_CASA'
-            if self.path: self.start_next_path_step()
+    # --- PLAN DE VIAJES ---
+    def plan_tour(self, world):
+        """Replanifica los viajes con los gnomos conocidos y devuelve la lista de Trip."""
+        trips = self.mission_planner.plan((self.row, self.col), len(self.inventory), self.battery)
+        pos, self.potential_decisions = (self.row, self.col), []
+        for k, gnome_pos in enumerate(trips[0].stops):
+            cost = self.mission_planner.cost(pos, gnome_pos)
+            self.potential_decisions.append({"target": gnome_pos, "path": None, "cost": cost, "benefit": -k})
+            pos = gnome_pos
+        return trips
+
+    def choose_frontier(self, start, avoid=(), field=None):
+        return self.frontier.choose_goal(start, self.config["cost_slow_cell"], VIEW_RANGE, avoid, field)
+
+    def explore(self, avoid=(), field=None):
+        # A mitad de un paso se planifica desde la celda a la que va (path[0]): el paso en curso se conserva
+        moving = self.action in ('GIRANDO', 'MOVIENDOSE') and self.path
+        start = self.path[0] if moving else (self.row, self.col)
+        goal = self.choose_frontier(start, avoid, field if not moving else None)
+        if goal is None:
+            # Sin fronteras alcanzables: todo lo que se puede ver ya se ha visto
+            if self.action == 'ESPERANDO': self.state = 'TERMINADO'
+            self.current_target_pos = None
             return
+        self.current_target_pos = goal
+        path = self.plan_path(goal, start)
+        if moving: self.path = path or self.path[:1]
+        else: self.path = path
+
+    def go_to_known_gnome(self):
+        """Modo greedy: va al gnomo más cercano de los que ya están en memoria; False si no hay.
 
-        if self.state == 'BUSCANDO':
+        Los gnomos vistos mientras se iba a otro no se escanean al volver a BUSCANDO,
+        y con fronteras nada obliga a verlos otra vez.
+        """
+        best = None
+        for r, c in np.argwhere(self.memory_grid.array == MEM_GNOME).tolist():
+            path = find_path_astar(self.memory_grid, (self.row, self.col), (r, c), self.config["cost_slow_cell"])
+            if path and len(path) > 1 and (best is None or len(path) < len(best)): best = path
+        if best is None: return False
+        self.potential_decisions = [{"target": best[-1], "path": best, "cost": len(best) - 1, "benefit": 1000 / (len(best) - 1)}]
+        self.go_to_gnome(best[-1], best)
+        return True
+
+    def go_to_gnome(self, gnome_pos, path=None):
+        self.state = 'YENDO_AL_GNOMO'
+        self.current_target_pos = gnome_pos
+        self.path = path if path is not None else self.plan_path(gnome_pos)
+        self.discovered_gnomes.add(gnome_pos)
+        if self.path: self.start_next_path_step()
+
+    def pick_up(self, world, gnome_pos):
+        if gnome_pos in world.gnomes:
+            world.gnomes.remove(gnome_pos)
+            world.grid[gnome_pos] = 0
+            self.inventory.append(gnome_pos)
+
+    def return_if_low_battery(self, world):
+        # Se vuelve justo cuando la batería solo da para llegar a casa (más un margen); el umbral
+        # fijo queda para cuando el campo no conoce camino desde aquí
+        needed = self.home_field.energy(self.row, self.col, self.path[0] if self.path else None)
+        reserve = needed + self.config["return_margin"] if needed != math.inf else self.config["battery_low_threshold"]
+        if self.battery > reserve or self.state in ['VOLVIENDO_A_CASA', 'CARGANDO']: return False
+        self.saved_state, self.saved_target_pos = self.state, self.current_target_pos
+        self.current_target_pos = world.home_base
+        self.path = self.home_field.path_home(self.row, self.col) or self.plan_path(self.current_target_pos)
+        self.state = 'VOLVIENDO_A_CASA'
+        if self.path: self.start_next_path_step()
+        return True
+
+    def update_charging(self, world, dt):
+        if self.state == 'VOLVIENDO_A_CASA':
+            self.state = 'CARGANDO'
+        elif self.state == 'CARGANDO':
+            self.battery += self.config["charge_rate"] * dt
+            if self.battery >= self.config["battery_capacity"]:
+                self.battery = self.config["battery_capacity"]
+                self.state = self.saved_state if self.saved_state else 'BUSCANDO'
+                self.current_target_pos = self.saved_target_pos
+                if self.current_target_pos:
+                    self.path = self.plan_path(self.current_target_pos)
+                else: self.state = 'BUSCANDO'; self.path = None
+                self.saved_state, self.saved_target_pos = None, None
+
+    def update_logic(self, world, dt):
+        if self.return_if_low_battery(world): return
+
+        if self.config.get("mission_planner") == 'tour':
+            if self.mission_planner is None:
+                self.mission_planner = MissionPlanner(self.memory_grid, world.home_base, self.config)
+            found_gnomes = self.scan_for_gnomes(world)
+            for gnome_pos in found_gnomes:
+                self.discovered_gnomes.add(gnome_pos)
+                self.mission_planner.add_gnome(gnome_pos)
+            # Se replanifica al ver gnomos nuevos o entre puntos de patrulla (el mapa ha crecido)
+            if self.state == 'BUSCANDO' and self.mission_planner.known_gnomes and (found_gnomes or self.action == 'ESPERANDO'):
+                trips = self.plan_tour(world)
+                if trips[0].stops:
+                    self.go_to_gnome(trips[0].stops[0])
+                    return
+                if len(trips) > 1:
+                    # Hay gnomos a tiro de una carga completa pero no de la batería actual
+                    self.saved_state, self.saved_target_pos = 'BUSCANDO', None
+                    self.current_target_pos = world.home_base
+                    self.path = self.plan_path(self.current_target_pos)
+                    self.state = 'VOLVIENDO_A_CASA'
+                    if self.path: self.start_next_path_step()
+                    return
+
+        elif self.state == 'BUSCANDO':
             self.potential_decisions = []
             found_gnomes = self.scan_for_gnomes(world)
             if found_gnomes:
                 for gnome_pos in found_gnomes:
-                    path = find_path_astar(self.memory_grid, (self.row, self.col), gnome_pos)
+                    path = find_path_astar(self.memory_grid, (self.row, self.col), gnome_pos, self.config["cost_slow_cell"])
                     if path and len(path) > 1:
                         cost = len(path) - 1
                         benefit = 1000 / cost
                         self.potential_decisions.append({"target": gnome_pos, "path": path, "cost": cost, "benefit": benefit})
                 if self.potential_decisions:
                     best_decision = max(self.potential_decisions, key=lambda d: d['benefit'])
-                    self.state = 'YENDO_AL_GNOMO'
-                    self.current_target_pos = best_decision['target']
-                    self.path = best_decision['path']
-                    self.discovered_gnomes.add(best_decision['target'])
-                    if self.path: self.start_next_path_step()
+                    self.go_to_gnome(best_decision['target'], best_decision['path'])
                     return
-            
+
+        if self.state == 'BUSCANDO' and self.frontier is not None:
+            # Se elige otra frontera al llegar o cuando la actual ya se ha descubierto por el camino;
+            # sin meta (no quedaba frontera) se espera al final del paso en vez de buscar en cada tick
+            target = self.current_target_pos
+            if self.action == 'ESPERANDO' or (target is not None and target not in self.frontier):
+                if self.action == 'ESPERANDO' and self.config.get("mission_planner") != 'tour' and self.go_to_known_gnome(): return
+                self.potential_decisions = []
+                self.explore()
+        elif self.state == 'BUSCANDO':
             if self.action == 'ESPERANDO':
                 self.potential_decisions = []
                 if self.patrol_index < len(self.patrol_points):
                     next_patrol = self.patrol_points[self.patrol_index]
                     if (self.row, self.col) != next_patrol:
-                        self.path = find_path_astar(self.memory_grid, (self.row, self.col), next_patrol)
+                        self.path = self.plan_path(next_patrol)
                         self.current_target_pos = next_patrol
                     self.patrol_index += 1
                 else: self.state = 'TERMINADO'
@@ -176,28 +348,23 @@ class SimulatedRobot:
 
         if self.state == 'YENDO_AL_GNOMO':
             gnome_pos = self.current_target_pos
-            if gnome_pos in world.gnomes:
-                world.gnomes.remove(gnome_pos)
-                world.grid[gnome_pos[0]][gnome_pos[1]] = 0
-                self.inventory.append(gnome_pos)
+            self.pick_up(world, gnome_pos)
+            if self.mission_planner:
+                self.mission_planner.remove_gnome(gnome_pos)
+                # Mientras quepan más, el plan decide si seguir recogiendo o volver a descargar
+                if len(self.inventory) < self.mission_planner.capacity:
+                    trips = self.plan_tour(world)
+                    if trips[0].stops:
+                        self.go_to_gnome(trips[0].stops[0])
+                        return
             self.state = 'YENDO_A_BASE'
             self.current_target_pos = world.home_base
-            self.path = find_path_astar(self.memory_grid, (self.row, self.col), self.current_target_pos)
+            self.path = self.plan_path(self.current_target_pos)
         elif self.state == 'YENDO_A_BASE':
-            if self.inventory: self.inventory.pop(0)
+            self.delivered += len(self.inventory)
+            self.inventory.clear()
             self.state = 'BUSCANDO'
             self.current_target_pos = None
-        elif self.state == 'VOLVIENDO_A_CASA':
-            self.state = 'CARGANDO'
-        elif self.state == 'CARGANDO':
-            self.battery += CONFIG["charge_rate"] * dt
-            if self.battery >= CONFIG["battery_capacity"]:
-                self.battery = CONFIG["battery_capacity"]
-                self.state = self.saved_state if self.saved_state else 'BUSCANDO'
-                self.current_target_pos = self.saved_target_pos
-                if self.current_target_pos:
-                    self.path = find_path_astar(self.memory_grid, (self.row, self.col), self.current_target_pos)
-                else: self.state = 'BUSCANDO'; self.path = None
-                self.saved_state, self.saved_target_pos = None, None
-        
+        else: self.update_charging(world, dt)
+
         if self.action == 'ESPERANDO' and self.path: self.start_next_path_step()
@@ -0,0 +1,275 @@
+# controller.py
+# Sustituto del módulo `controller` de Webots para correr los controladores sin Webots.
+# Implementa solo lo que usan controladorRobot y controlador_propio: Robot, Motor,
+# PositionSensor, Camera y RangeFinder, sobre un modelo cinemático diferencial y
+# cámara/profundidad sintéticas renderizadas desde un World de pythonTesting.
+# Se configura con configure() antes de que el controlador cree su Robot().
+
+import math
+import numpy as np
+
+# --- MODELOS DE ROBOT ---
+# Geometría y dispositivos de los robots de Webots que usan nuestros controladores
+TIAGO_JOINTS = [
+    "head_2_joint", "head_1_joint", "torso_lift_joint", "arm_1_joint",
+    "arm_2_joint",  "arm_3_joint",  "arm_4_joint",      "arm_5_joint",
+    "arm_6_joint",  "arm_7_joint",
+]
+
+ROBOT_MODELS = {
+    "tiago": {
+        "wheels": ("wheel_left_joint", "wheel_right_joint"),
+        "wheel_radius": 0.0985, "axle_length": 0.4044, "max_wheel_speed": 10.15, "body_radius": 0.27,
+        "joints": TIAGO_JOINTS,
+        "sensors": {"wheel_left_joint_sensor": "wheel_left_joint", "wheel_right_joint_sensor": "wheel_right_joint"},
+        "cameras": {"Astra rgb": {"width": 640, "height": 480, "fov": 1.0, "mount_height": 1.1}},
+        "range_finders": {"Astra depth": {"width": 640, "height": 480, "fov": 1.0, "max_range": 8.0, "mount_height": 1.1}},
+    },
+    "pioneer": {
+        "wheels": ("left wheel", "right wheel"),
+        "wheel_radius": 0.0975, "axle_length": 0.33, "max_wheel_speed": 12.3, "body_radius": 0.26,
+        "joints": [],
+        "sensors": {"left wheel sensor": "left wheel", "right wheel sensor": "right wheel"},
+        "cameras": {"kinect color": {"width": 320, "height": 190, "fov": 1.0, "mount_height": 0.45}},
+        "range_finders": {"kinect range": {"width": 320, "height": 190, "fov": 1.0, "max_range": 3.5, "mount_height": 0.45}},
+    },
+}
+
+GNOME_RADIUS = 0.15
+GNOME_HEIGHT = 0.4
+
+# Colores BGRA de la cámara sintética (el gnomo pasa los umbrales de gnome_vision)
+COLOR_WALL = (150, 150, 150, 255)
+COLOR_GNOME = (30, 30, 200, 255)
+COLOR_FLOOR = (60, 110, 140, 255)
+# Un uint32 por etiqueta: colorear la imagen es una sola indexación
+PALETTE = np.array([COLOR_WALL, COLOR_GNOME, COLOR_FLOOR], dtype=np.uint8).view(np.uint32).ravel()
+
+# --- SIMULACIÓN ---
+class Simulation:
+    """Estado compartido por el Robot y sus dispositivos: mundo, pose y reloj."""
+    def __init__(self, world, model="tiago", pose=(0.0, 0.0, 0.0), basic_time_step=32, max_time=None, overrides=None):
+        self.world = world
+        self.model = {**ROBOT_MODELS[model], **(overrides or {})}
+        self.x, self.y, self.theta = pose
+        self.basic_time_step = basic_time_step
+        self.max_time = max_time
+        self.time = 0.0
+        self.steps = 0
+        self.devices = {}
+
+    def integrate(self, dt):
+        """Cinemática diferencial: avanza la pose con las velocidades actuales de las ruedas."""
+        left, right = (self.devices[name] for name in self.model["wheels"])
+        left.integrate(dt)
+        right.integrate(dt)
+        radius = self.model["wheel_radius"]
+        v = radius * (left.velocity + right.velocity) / 2.0
+        w = radius * (right.velocity - left.velocity) / self.model["axle_length"]
+        if abs(w) < 1e-9:
+            self.x += v * math.cos(self.theta) * dt
+            self.y += v * math.sin(self.theta) * dt
+        else:
+            # Arco exacto para un paso con velocidades constantes
+            new_theta = self.theta + w * dt
+            self.x += v / w * (math.sin(new_theta) - math.sin(self.theta))
+            self.y -= v / w * (math.cos(new_theta) - math.cos(self.theta))
+            self.theta = math.atan2(math.sin(new_theta), math.cos(new_theta))
+        # Las paredes de la arena detienen al robot
+        margin = self.model["body_radius"]
+        self.x = min(max(self.x, margin), self.world.width - margin)
+        self.y = min(max(self.y, margin), self.world.height - margin)
+
+    def render(self, spec):
+        """Etiqueta de lo visto por píxel (0 pared, 1 gnomo, 2 suelo) y lo necesario para su profundidad."""
+        width, height, fov = spec["width"], spec["height"], spec["fov"]
+        mount, max_range = spec["mount_height"], spec.get("max_range", math.inf)
+        # Cámara estenopeica: ángulo de cada columna, positivo a la izquierda
+        focal = (width / 2.0) / math.tan(fov / 2.0)
+        offsets = np.arctan((width / 2.0 - np.arange(width) - 0.5) / focal)
+        angles = self.theta + offsets
+        cos_a, sin_a = np.cos(angles), np.sin(angles)
+
+        # Paredes de la arena: primera pared que corta cada rayo
+        with np.errstate(divide='ignore'):
+            tx = np.where(cos_a > 0, (self.world.width - self.x) / cos_a, np.where(cos_a < 0, -self.x / cos_a, np.inf))
+            ty = np.where(sin_a > 0, (self.world.height - self.y) / sin_a, np.where(sin_a < 0, -self.y / sin_a, np.inf))
+        wall = np.minimum(tx, ty)
+
+        # Gnomos (cilindros) a tiro, sacados del índice espacial del mundo
+        near = self.world.gnomes_near((self.x, self.y), min(max_range, math.hypot(self.world.width, self.world.height)) + GNOME_RADIUS)
+        gnome = np.full(width, np.inf)
+        if near:
+            g = np.array(near)
+            dx, dy = g[:, 0] - self.x, g[:, 1] - self.y
+            along = np.outer(cos_a, dx) + np.outer(sin_a, dy)
+            miss2 = (dx**2 + dy**2) - along**2
+            with np.errstate(invalid='ignore'):
+                hit = along - np.sqrt(GNOME_RADIUS**2 - miss2)
+            hit[(miss2 > GNOME_RADIUS**2) | (hit <= 0)] = np.inf
+            gnome = hit.min(axis=1)
+
+        # Distancia a lo largo del eje óptico (profundidad plana, como Webots)
+        cos_off = np.cos(offsets)
+        wall_depth, gnome_depth = wall * cos_off, gnome * cos_off
+        has_gnome = gnome_depth < wall_depth
+        near_depth = np.where(has_gnome, gnome_depth, wall_depth)
+        # Cada columna es pared, luego gnomo y luego suelo, de arriba abajo. Los cortes se
+        # expresan como desplazamiento respecto al horizonte (positivo hacia abajo):
+        # el gnomo empieza donde se ve su parte superior y el suelo donde está más cerca que lo de delante
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gnome_start = np.where(has_gnome, focal * (mount - GNOME_HEIGHT) / gnome_depth, np.inf)
+            floor_start = mount * focal / near_depth
+        rows = (np.arange(height) + 0.5 - height / 2.0)[:, None]
+        is_floor = rows > floor_start
+        label = (rows >= gnome_start) & ~is_floor
+        label = label.view(np.uint8) + 2 * is_floor.view(np.uint8)
+        return label, rows, wall_depth, gnome_depth, mount * focal
+
+simulation = None
+
+def configure(world, model="tiago", pose=(0.0, 0.0, 0.0), basic_time_step=32, max_time=None, overrides=None):
+    """Prepara el mundo que verá el próximo Robot(). Devuelve la Simulation para inspeccionarla."""
+    global simulation
+    simulation = Simulation(world, model, pose, basic_time_step, max_time, overrides)
+    return simulation
+
+# --- DISPOSITIVOS ---
+class Device:
+    def __init__(self, name, sim):
+        self.name, self.sim = name, sim
+
+    def getName(self):
+        return self.name
+
+class Motor(Device):
+    def __init__(self, name, sim, max_velocity=math.inf):
+        super().__init__(name, sim)
+        self.max_velocity = max_velocity
+        self.target_position = 0.0
+        self.position = 0.0
+        self.velocity = 0.0
+
+    def setPosition(self, position):
+        # Con inf el motor pasa a control en velocidad; si no, la articulación salta a la posición
+        self.target_position = position
+        if position != math.inf: self.position = position
+
+    def setVelocity(self, velocity):
+        self.velocity = max(-self.max_velocity, min(self.max_velocity, velocity))
+
+    def getVelocity(self):
+        return self.velocity
+
+    def getMaxVelocity(self):
+        return self.max_velocity
+
+    def integrate(self, dt):
+        if self.target_position == math.inf: self.position += self.velocity * dt
+
+class PositionSensor(Device):
+    def __init__(self, name, sim, motor):
+        super().__init__(name, sim)
+        self.motor, self.period = motor, 0
+
+    def enable(self, sampling_period):
+        self.period = sampling_period
+
+    def disable(self):
+        self.period = 0
+
+    def getValue(self):
+        return self.motor.position if self.period else float('nan')
+
+class ImagingDevice(Device):
+    """Base de Camera y RangeFinder: renderiza como mucho una vez por paso y solo si se lee."""
+    def __init__(self, name, sim, spec):
+        super().__init__(name, sim)
+        self.spec, self.period = spec, 0
+        self.cached_step, self.cached = None, None
+
+    def enable(self, sampling_period):
+        self.period = sampling_period
+
+    def disable(self):
+        self.period = 0
+
+    def getWidth(self):
+        return self.spec["width"]
+
+    def getHeight(self):
+        return self.spec["height"]
+
+    def getFov(self):
+        return self.spec["fov"]
+
+    def frame(self):
+        if not self.period: return None
+        if self.cached_step != self.sim.steps:
+            self.cached_step, self.cached = self.sim.steps, self.sim.render(self.spec)
+        return self.cached
+
+class Camera(ImagingDevice):
+    def getImage(self):
+        """Imagen BGRA como bytes, igual que Camera.getImage() de Webots."""
+        frame = self.frame()
+        if frame is None: return None
+        return PALETTE[frame[0]].tobytes()
+
+class RangeFinder(ImagingDevice):
+    def getMaxRange(self):
+        return self.spec["max_range"]
+
+    def getMinRange(self):
+        return 0.0
+
+    def getRangeImage(self, data_type="list"):
+        frame = self.frame()
+        if frame is None: return None
+        label, rows, wall_depth, gnome_depth, floor_scale = frame
+        with np.errstate(divide='ignore'):
+            floor_depth = floor_scale / rows
+        depth = np.where(label == 2, floor_depth, np.where(label == 1, gnome_depth, wall_depth)).astype(np.float32)
+        depth[depth > self.spec["max_range"]] = np.inf
+        return depth.tobytes() if data_type == "buffer" else depth.ravel().tolist()
+
+    @staticmethod
+    def rangeImageGetDepth(image, width, x, y):
+        return image[y * width + x]
+
+# --- ROBOT ---
+class Robot:
+    def __init__(self):
+        if simulation is None:
+            raise RuntimeError("controller.configure(world, ...) debe llamarse antes de crear el Robot")
+        self.sim = simulation
+        model = self.sim.model
+        devices = self.sim.devices
+        for name in list(model["wheels"]) + list(model["joints"]):
+            devices[name] = Motor(name, self.sim, model["max_wheel_speed"] if name in model["wheels"] else math.inf)
+        for name, motor in model["sensors"].items():
+            devices[name] = PositionSensor(name, self.sim, devices[motor])
+        for name, spec in model["cameras"].items():
+            devices[name] = Camera(name, self.sim, spec)
+        for name, spec in model["range_finders"].items():
+            devices[name] = RangeFinder(name, self.sim, spec)
+
+    def getBasicTimeStep(self):
+        return float(self.sim.basic_time_step)
+
+    def getTime(self):
+        return self.sim.time
+
+    def getDevice(self, name):
+        device = self.sim.devices.get(name)
+        if device is None: print(f"Warning: dispositivo '{name}' no existe en el modelo simulado")
+        return device
+
+    def step(self, duration):
+        sim = self.sim
+        if sim.max_time is not None and sim.time >= sim.max_time: return -1
+        dt = duration / 1000.0
+        sim.integrate(dt)
+        sim.time += dt
+        sim.steps += 1
+        return 0
@@ -0,0 +1,81 @@
+# run_controller.py
+# Ejecuta un controlador de Webots sin Webots, más rápido que el tiempo real, sobre el
+# sustituto de fakewebots/controller.py.
+#   python run_controller.py tiago --max-time 300
+#   python run_controller.py pioneer --max-time 60 --profile
+import argparse
+import cProfile
+import os
+import pstats
+import runpy
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONTROLLERS = {
+    "tiago": os.path.join(HERE, "..", "controllers", "controladorRobot", "controladorRobot.py"),
+    "pioneer": os.path.join(HERE, "..", "controllers", "controlador_propio", "controller.py"),
+}
+
+# El sustituto tiene que ganar al `controller` de Webots si también estuviera instalado
+sys.path.insert(0, os.path.join(HERE, "fakewebots"))
+sys.path.insert(1, HERE)
+import controller
+from World import World
+
+def run(model, max_time, seed=None, num_gnomes=10, pose=(0.5, 0.5, 0.0), time_step=32, image_size=None):
+    """Corre el controlador del modelo hasta max_time segundos simulados. Devuelve resumen y globals del script."""
+    world = World({"num_gnomes": num_gnomes}, seed)
+    overrides = None
+    if image_size:
+        # Resolución reducida para cámara y profundidad: el renderizado y la visión escalan con ella
+        width, height = image_size
+        models = controller.ROBOT_MODELS[model]
+        overrides = {kind: {name: {**spec, "width": width, "height": height} for name, spec in models[kind].items()}
+                     for kind in ("cameras", "range_finders")}
+    sim = controller.configure(world, model, pose, time_step, max_time, overrides)
+
+    script = os.path.abspath(CONTROLLERS[model])
+    sys.path.insert(0, os.path.dirname(script))
+    start = time.perf_counter()
+    try:
+        script_globals = runpy.run_path(script, run_name="__main__")
+    finally:
+        sys.path.remove(os.path.dirname(script))
+    wall_time = time.perf_counter() - start
+    summary = {
+        "model": model, "seed": world.seed, "sim_time": round(sim.time, 3), "steps": sim.steps,
+        "wall_time": round(wall_time, 3), "steps_per_second": round(sim.steps / wall_time, 1) if wall_time else 0.0,
+        "realtime_factor": round(sim.time / wall_time, 1) if wall_time else 0.0,
+        "final_pose": (round(sim.x, 3), round(sim.y, 3), round(sim.theta, 3)),
+    }
+    return summary, world, script_globals
+
+def main():
+    parser = argparse.ArgumentParser(description="Controladores de Webots sin Webots (fakewebots)")
+    parser.add_argument("model", choices=sorted(CONTROLLERS))
+    parser.add_argument("--max-time", type=float, default=120.0, help="segundos simulados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gnomes", type=int, default=10)
+    parser.add_argument("--time-step", type=int, default=32, help="basicTimeStep del mundo, en ms")
+    parser.add_argument("--image-size", default=None, metavar="ANCHOxALTO", help="p. ej. 160x120")
+    parser.add_argument("--profile", action="store_true", help="perfil de cProfile de la ejecución")
+    args = parser.parse_args()
+
+    image_size = tuple(int(v) for v in args.image_size.split("x")) if args.image_size else None
+    call = lambda: run(args.model, args.max_time, args.seed, args.gnomes, time_step=args.time_step, image_size=image_size)
+    if args.profile:
+        profiler = cProfile.Profile()
+        summary, world, script_globals = profiler.runcall(call)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    else:
+        summary, world, script_globals = call()
+
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    tiago = script_globals.get("controller")
+    if args.model == "tiago" and tiago is not None:
+        print(f"estado final: {tiago.state}, gnomos detectados: {len(tiago.gnome_locations)} de {len(world.gnomes)}")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ CONFIG = {
     "num_gnomes": 8, "robot_speed": 1.5, "Kp_turn": 4.0, "camera_fov_degrees": 70,
     "battery_capacity": 100.0, "battery_low_threshold": 25.0, "time_step": 0.01,
     "camera_range": 3.0, "drain_base": 0.1, "drain_move": 1.0, "drain_turn": 0.5, "charge_rate": 10.0,
+    "seed": None, # None = new seed on every reset (shown when the mission ends)
 }
 
 # --- Global Simulation State ---
@@ -18,9 +19,12 @@ vpython_objects, run_button = {}, None
 discovered_gnome_count = 0 # Counter for labeling discovered gnomes
 
 class World:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # Own RNG per run, so the same seed always rebuilds the same world
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.rng = random.Random(self.seed)
         self.width, self.height = 10.0, 10.0
-        self.gnomes = [(random.uniform(1.0, self.width - 1.0), random.uniform(1.0, self.height - 1.0)) for _ in range(CONFIG["num_gnomes"])]
+        self.gnomes = [(self.rng.uniform(1.0, self.width - 1.0), self.rng.uniform(1.0, self.height - 1.0)) for _ in range(CONFIG["num_gnomes"])]
 
 class SimulatedRobot:
     def __init__(self):
@@ -123,7 +127,7 @@ def reset_simulation():
     for k, o_list in list(vpython_objects.items()):
         for o in o_list: o.visible=False; del o;
         del vpython_objects[k]
-    world, robot = World(), SimulatedRobot()
+    world, robot = World(CONFIG["seed"]), SimulatedRobot()
     discovered_gnome_count = 0 # <<< MODIFIED: Reset counter
     vpython_objects["gnomes"] = [cylinder(pos=vector(p[0],0.2,p[1]),axis=vector(0,0.4,0),radius=0.15,color=color.red) for p in world.gnomes]
     r_obj=compound([cylinder(axis=vector(0,0.3,0),radius=0.25,color=color.blue), arrow(pos=vector(0,0.15,0),axis=vector(0.3,0,0),color=color.white,shaftwidth=0.05)])
@@ -197,4 +201,4 @@ while True:
             if rem_obj: rem_obj.visible=False; vpython_objects["gnomes"].remove(rem_obj); del rem_obj
             
     if robot.state == 'FINISHED' or robot.battery <= 0:
-        simulation_running, run_button.text = False, "Reset"; label_status.text = "¡Batería agotada!" if robot.battery <= 0 else "¡Misión Completa!"
\ No newline at end of file
+        simulation_running, run_button.text = False, "Reset"; label_status.text = ("¡Batería agotada!" if robot.battery <= 0 else "¡Misión Completa!") + f" (seed {world.seed})"
\ No newline at end of file